@@ -3,16 +3,62 @@ AI-powered button analyzer for page source XML.
 Sends page source to AI for button detection and extraction.
 """
 
-import xml.etree.ElementTree as ET
+import io
+from pypy_compat import IS_CPYTHON
+
+ET = None
+if IS_CPYTHON:
+    try:
+        # lxml (libxml2) parses large page sources several times faster than stdlib ElementTree
+        from lxml import etree as ET
+    except ImportError:
+        pass
+if ET is None:
+    import xml.etree.ElementTree as ET
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import BinaryIO, List, Dict, Optional, Tuple, Union
 import logging
 
+ahocorasick = None
+if IS_CPYTHON:
+    try:
+        # pyahocorasick matches all context keywords in one pass over the text
+        import ahocorasick
+    except ImportError:
+        pass
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
-def send_xml_to_ai(xml_content: str, action_context: str = "analyze buttons") -> Dict:
+@lru_cache(maxsize=32)
+def _keyword_automaton(keywords: Tuple[str, ...]):
+    """
+    Build an Aho-Corasick automaton for a tuple of lowercase keywords (cached per tuple).
+    
+    Returns:
+        ahocorasick.Automaton or None if pyahocorasick is not installed / no keywords
+    """
+    if ahocorasick is None or not keywords:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+def _count_keyword_hits(text: str, keywords: Tuple[str, ...], automaton=None) -> int:
+    """Count how many distinct keywords occur in text (single scan when an automaton is given)."""
+    if automaton is not None:
+        return len({keyword for _, keyword in automaton.iter(text)})
+    return sum(1 for keyword in keywords if keyword in text)
+
+
+def send_xml_to_ai(xml_content: str, action_context: str = "analyze buttons",
+                   max_matches: Optional[int] = None) -> Dict:
     """
     Send page source XML to AI for analysis.
     Logs when sending and receives button detection results.
@@ -20,6 +66,7 @@ def send_xml_to_ai(xml_content: str, action_context: str = "analyze buttons") ->
     Args:
         xml_content: The page source XML content
         action_context: Context about what we're looking for (e.g., "like button", "swipe button")
+        max_matches: Stop scanning once this many buttons are found (None = scan everything)
         
     Returns:
         dict: AI analysis results with button locators
@@ -31,7 +78,7 @@ def send_xml_to_ai(xml_content: str, action_context: str = "analyze buttons") ->
     logger.info("=" * 60)
     
     # Analyze XML locally first (fast, no API needed)
-    buttons = analyze_xml_for_buttons(xml_content, action_context)
+    buttons = analyze_xml_for_buttons(xml_content, action_context, max_matches=max_matches)
     
     # If we need more advanced analysis, we can use web search
     # For now, local analysis is sufficient
@@ -44,14 +91,20 @@ def send_xml_to_ai(xml_content: str, action_context: str = "analyze buttons") ->
     }
 
 
-def analyze_xml_for_buttons(xml_content: str, context: str = "") -> List[Dict]:
+def analyze_xml_for_buttons(xml_content: Union[str, BinaryIO], context: str = "",
+                            max_matches: Optional[int] = None) -> List[Dict]:
     """
     Analyze XML to find buttons and clickable elements.
     Uses AI-like pattern matching to identify buttons.
     
+    OPTIMIZED: Streams the XML with iterparse and clears each element once it has
+    been inspected, so large page sources are never held as a full tree.
+    
     Args:
-        xml_content: The page source XML content
+        xml_content: The page source XML content, or a binary file object to parse from
         context: What we're looking for (e.g., "like", "swipe", "close")
+        max_matches: Stop parsing once this many buttons are found (None = scan everything).
+                     Only applies without context keywords - relevance sorting needs every match.
         
     Returns:
         list: List of button information dictionaries
@@ -59,8 +112,6 @@ def analyze_xml_for_buttons(xml_content: str, context: str = "") -> List[Dict]:
     buttons = []
     
     try:
-        root = ET.fromstring(xml_content)
-        
         # Keywords to search for based on context
         context_keywords = []
         if context:
@@ -74,84 +125,37 @@ def analyze_xml_for_buttons(xml_content: str, context: str = "") -> List[Dict]:
             if "home" in context_lower:
                 context_keywords.extend(["home", "main"])
         
-        # Find all clickable elements
-        for elem in root.iter():
-            clickable = elem.get('clickable', 'false')
-            enabled = elem.get('enabled', 'true')
-            visible = elem.get('bounds') is not None
-            
-            # Check if element is interactive
-            is_button = (
-                clickable == 'true' or 
-                elem.get('class', '').lower().find('button') >= 0 or
-                elem.get('class', '').lower().find('clickable') >= 0
-            )
-            
-            if not (is_button and enabled == 'true' and visible):
+        # Lowercase the keywords once instead of per element / per sort comparison
+        kw_lower = tuple(keyword.lower() for keyword in context_keywords)
+        kw_automaton = _keyword_automaton(kw_lower)
+        
+        # Find all clickable elements (streamed - each element is cleared once its subtree is done).
+        # Inspected on "start" events so matches come in document (pre-)order like root.iter().
+        # Fed as bytes: lxml only accepts byte streams, stdlib ET handles both.
+        if isinstance(xml_content, str):
+            xml_stream = io.BytesIO(xml_content.encode('utf-8'))
+        else:
+            xml_stream = xml_content
+        buttons_append = buttons.append
+        # Early exit only when unsorted - with keywords the best match may come last
+        limit = None if kw_lower else max_matches
+        for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+            if event == "end":
+                elem.clear()
                 continue
             
-            resource_id = elem.get('resource-id', '')
-            content_desc = elem.get('content-desc', '') or ''
-            text = elem.get('text', '') or ''
-            class_name = elem.get('class', '')
-            
-            # Combine text and content-desc for matching
-            combined_text = f"{content_desc} {text}".lower()
-            
-            # Check if this matches our context
-            matches_context = False
-            if context_keywords:
-                matches_context = any(keyword.lower() in combined_text for keyword in context_keywords)
-            else:
-                matches_context = True  # If no context, include all buttons
-            
-            if matches_context or not context:
-                button_info = {
-                    'resource_id': resource_id,
-                    'content_desc': content_desc,
-                    'text': text,
-                    'class': class_name,
-                    'bounds': elem.get('bounds', ''),
-                    'clickable': clickable,
-                    'enabled': enabled,
-                    'locators': []
-                }
-                
-                # Generate locators for this button
-                locators = []
-                
-                # Resource ID locator
-                if resource_id:
-                    locators.append(("id", resource_id))
-                
-                # Content description locator
-                if content_desc:
-                    locators.append(("accessibility_id", content_desc))
-                    # XPath for content-desc
-                    if content_desc:
-                        locators.append(("xpath", f"//*[@content-desc='{content_desc}']"))
+            button_info = _filter_button(elem.attrib, kw_lower, kw_automaton)
+            if button_info is not None:
+                buttons_append(button_info)
+                logger.debug(f"[AI] Found button: {button_info['content_desc'] or button_info['text'] or button_info['resource_id']}")
                 
-                # Text locator
-                if text:
-                    locators.append(("xpath", f"//*[@text='{text}']"))
-                
-                # XPath with contains for fuzzy matching
-                if content_desc:
-                    locators.append(("xpath", f"//*[contains(@content-desc, '{content_desc}')]"))
-                if text:
-                    locators.append(("xpath", f"//*[contains(@text, '{text}')]"))
-                
-                button_info['locators'] = locators
-                buttons.append(button_info)
-                
-                logger.debug(f"[AI] Found button: {content_desc or text or resource_id}")
+                # Early exit - caller only needs the first few matches
+                if limit and len(buttons) >= limit:
+                    break
         
-        # Sort by relevance (exact matches first, then partial)
-        if context_keywords:
-            buttons.sort(key=lambda b: (
-                -sum(1 for kw in context_keywords if kw.lower() in (b['content_desc'] + ' ' + b['text']).lower()),
-                -len(b['resource_id']),
-            ), reverse=True)
+        # Sort by relevance (most keyword hits first, then partial) - stable, integer keys only
+        if kw_lower:
+            buttons.sort(key=itemgetter('_score'), reverse=True)
         
     except Exception as e:
         logger.error(f"[AI] Error analyzing XML: {e}")
@@ -160,6 +164,109 @@ def analyze_xml_for_buttons(xml_content: str, context: str = "") -> List[Dict]:
     return buttons
 
 
+def _filter_button(attrs, kw_lower: Tuple[str, ...], kw_automaton=None) -> Optional[Dict]:
+    """
+    Per-element filter for analyze_xml_for_buttons (the hot path).
+    Works on the element's attribute mapping directly so each attribute is a single lookup.
+    
+    Args:
+        attrs: Element attribute mapping (elem.attrib)
+        kw_lower: Lowercase context keywords (empty tuple = accept every button)
+        kw_automaton: Optional Aho-Corasick automaton built from kw_lower
+        
+    Returns:
+        dict: Button information, or None if the element is not a matching button
+    """
+    get = attrs.get
+    clickable = get('clickable', 'false')
+    class_name = get('class', '')
+    
+    # Prefilter: most nodes are plain layouts - reject them before any other
+    # attribute reads or string work (class check only when not clickable)
+    if clickable != 'true':
+        if not class_name:
+            return None
+        class_lower = class_name.lower()
+        if 'button' not in class_lower and 'clickable' not in class_lower:
+            return None
+    
+    enabled = get('enabled', 'true')
+    bounds = get('bounds')
+    
+    if enabled != 'true' or bounds is None:
+        return None
+    
+    resource_id = get('resource-id', '')
+    content_desc = get('content-desc', '') or ''
+    text = get('text', '') or ''
+    
+    # Check if this matches our context (no keywords = include all buttons)
+    keyword_hits = 0
+    if kw_lower:
+        combined_text = f"{content_desc} {text}".lower()
+        keyword_hits = _count_keyword_hits(combined_text, kw_lower, kw_automaton)
+        if not keyword_hits:
+            return None
+    
+    return {
+        'resource_id': resource_id,
+        'content_desc': content_desc,
+        'text': text,
+        'class': class_name,
+        'bounds': bounds,
+        'clickable': clickable,
+        'enabled': enabled,
+        # Locators are built on demand with make_locators() - most buttons never need them
+        '_attrs': (resource_id, content_desc, text),
+        # Relevance computed once: keyword hits first, then longer (more specific) resource ID
+        '_score': keyword_hits * 1000 + len(resource_id)
+    }
+
+
+def make_locators(attrs: Tuple[str, str, str]) -> List[Tuple[str, str]]:
+    """
+    Build the locator list for a button found by analyze_xml_for_buttons.
+    
+    Args:
+        attrs: The button's '_attrs' tuple (resource_id, content_desc, text)
+        
+    Returns:
+        list: List of (locator_type, locator_value) tuples, ordered by reliability
+    """
+    return list(_make_locators(*attrs))
+
+
+@lru_cache(maxsize=1024)
+def _make_locators(resource_id: str, content_desc: str, text: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Format the locators for one (resource_id, content_desc, text) combination.
+    Cached: buttons sharing the same attributes reuse the same immutable locator tuples
+    instead of formatting the XPath strings again.
+    """
+    locators = []
+    
+    # Resource ID locator
+    if resource_id:
+        locators.append(("id", resource_id))
+    
+    # Content description locator + XPath for content-desc
+    if content_desc:
+        locators.append(("accessibility_id", content_desc))
+        locators.append(("xpath", f"//*[@content-desc='{content_desc}']"))
+    
+    # Text locator
+    if text:
+        locators.append(("xpath", f"//*[@text='{text}']"))
+    
+    # XPath with contains for fuzzy matching
+    if content_desc:
+        locators.append(("xpath", f"//*[contains(@content-desc, '{content_desc}')]"))
+    if text:
+        locators.append(("xpath", f"//*[contains(@text, '{text}')]"))
+    
+    return tuple(locators)
+
+
 def get_button_locators_from_xml(xml_content: str, button_type: str = "like") -> List[Tuple[str, str]]:
     """
     Extract button locators from page source XML.
@@ -174,7 +281,9 @@ def get_button_locators_from_xml(xml_content: str, button_type: str = "like") ->
     """
     logger.info(f"[AI] Extracting {button_type} button locators from XML...")
     
-    analysis = send_xml_to_ai(xml_content, f"find {button_type} button")
+    # Only buttons[0] is used below (the cap is ignored when the context yields keywords -
+    # the most relevant button can be anywhere in the tree)
+    analysis = send_xml_to_ai(xml_content, f"find {button_type} button", max_matches=8)
     buttons = analysis.get('buttons', [])
     
     if not buttons:
@@ -183,7 +292,7 @@ def get_button_locators_from_xml(xml_content: str, button_type: str = "like") ->
     
     # Get locators from the best matching button
     best_button = buttons[0]
-    locators = best_button.get('locators', [])
+    locators = make_locators(best_button['_attrs'])
     
     logger.info(f"[AI] Found {len(locators)} locators for {button_type} button")
     for loc_type, loc_value in locators[:5]:  # Show top 5
@@ -206,8 +315,19 @@ def analyze_page_source_file(filepath: Path, button_type: str = "") -> Dict:
     logger.info(f"[AI] Analyzing page source file: {filepath.name}")
     
     try:
-        xml_content = filepath.read_text(encoding='utf-8')
-        return send_xml_to_ai(xml_content, f"analyze buttons in {filepath.stem}")
+        action_context = f"analyze buttons in {filepath.stem}"
+        # Parse straight from the file's UTF-8 bytes (1 MB buffer) - no decoded str copy
+        # of the whole page source and no re-encoding before parsing
+        with filepath.open('rb', buffering=1 << 20) as f:
+            buttons = analyze_xml_for_buttons(f, action_context)
+            xml_size = f.tell()
+        
+        logger.info(f"[AI] Analysis complete - found {len(buttons)} potential buttons")
+        return {
+            'buttons': buttons,
+            'xml_size': xml_size,
+            'context': action_context
+        }
     except Exception as e:
         logger.error(f"[AI] Error reading file {filepath}: {e}")
         return {}
@@ -237,5 +357,5 @@ if __name__ == "__main__":
         logger.info(f"  Resource ID: {button.get('resource_id', 'N/A')}")
         logger.info(f"  Content Desc: {button.get('content_desc', 'N/A')}")
         logger.info(f"  Text: {button.get('text', 'N/A')}")
-        logger.info(f"  Locators: {len(button.get('locators', []))}")
+        logger.info(f"  Locators: {len(make_locators(button['_attrs']))}")
 
@@ -15,7 +15,14 @@ echo Make sure you've run the automation script first
 echo to generate page source files in page_sources/
 echo.
 
-python analyze_page_sources.py
+REM Prefer PyPy when installed - the analysis is pure-Python string/XML work that its JIT speeds up
+where pypy3 >nul 2>nul
+if %errorlevel%==0 (
+    echo Using PyPy for faster analysis...
+    pypy3 analyze_page_sources.py
+) else (
+    python analyze_page_sources.py
+)
 
 pause
 
@@ -3,75 +3,143 @@ Analyze saved page source files to extract real screen indicators.
 Uses AI analysis to understand the app structure, then updates the code.
 """
 
+import os
 import sys
-import xml.etree.ElementTree as ET
+from pypy_compat import IS_CPYTHON
+
+ET = None
+if IS_CPYTHON:
+    try:
+        # lxml (libxml2) parses large page sources several times faster than stdlib ElementTree
+        from lxml import etree as ET
+    except ImportError:
+        pass
+if ET is None:
+    import xml.etree.ElementTree as ET
 from pathlib import Path
-from collections import defaultdict
-import re
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+from operator import itemgetter
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Markers delimiting the SWIPE_SCREEN_INDICATORS list in pages/doubble_screens.py
+_SWIPE_INDICATORS_START = 'SWIPE_SCREEN_INDICATORS = ['
+_SWIPE_INDICATORS_END = '\n    ]'
+
+# Resource-id keywords marking swipe screen elements (all IDs / clickable IDs)
+_SWIPE_ID_KEYWORDS = ('swipe', 'like', 'card', 'profile', 'match')
+_SWIPE_BUTTON_ID_KEYWORDS = ('like', 'swipe', 'button')
+
+
+# Parsed files keyed by (path, mtime) - lives in the calling process only (worker processes
+# never touch it), so a rewritten file is parsed again and unchanged ones never are
+_PARSE_CACHE = {}
+_PARSE_CACHE_SIZE = 256
+
+
+def _cache_key(filepath: Path) -> Tuple[str, float]:
+    """Cache key for a page source file: its path and modification time."""
+    return str(filepath), filepath.stat().st_mtime
+
+
+def _remember(key: Tuple[str, float], analysis: dict):
+    """Store a parsed file in _PARSE_CACHE, dropping the oldest entry when full."""
+    if len(_PARSE_CACHE) >= _PARSE_CACHE_SIZE:
+        del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+    _PARSE_CACHE[key] = analysis
+
 
 def analyze_page_source_file(filepath: Path) -> dict:
     """
     Analyze a single page source XML file to extract element identifiers.
+    OPTIMIZED: Results are cached per (path, mtime) - unchanged files are only parsed once.
     
     Returns:
         dict: Extracted information about elements, IDs, content descriptions, etc.
+              Shared with the cache - treat as read-only.
     """
     try:
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        analysis = {
-            'resource_ids': set(),
-            'content_descriptions': set(),
-            'texts': set(),
-            'class_names': set(),
-            'clickable_elements': [],
-            'all_elements': []
-        }
-        
-        # Extract all element information
-        for elem in root.iter():
-            resource_id = elem.get('resource-id', '')
-            content_desc = elem.get('content-desc', '')
-            text = elem.get('text', '')
-            class_name = elem.get('class', '')
-            clickable = elem.get('clickable', 'false')
-            
-            if resource_id:
-                analysis['resource_ids'].add(resource_id)
-            if content_desc:
-                analysis['content_descriptions'].add(content_desc)
-            if text:
-                analysis['texts'].add(text)
-            if class_name:
-                analysis['class_names'].add(class_name)
-            
-            if clickable == 'true':
-                analysis['clickable_elements'].append({
-                    'resource_id': resource_id,
-                    'content_desc': content_desc,
-                    'text': text,
-                    'class': class_name
-                })
-            
-            analysis['all_elements'].append({
-                'resource_id': resource_id,
-                'content_desc': content_desc,
-                'text': text,
-                'class': class_name
-            })
-        
+        key = _cache_key(filepath)
+        analysis = _PARSE_CACHE.get(key)
+        if analysis is None:
+            analysis = _parse_file(key[0])
+            _remember(key, analysis)
         return analysis
     except Exception as e:
         logger.error(f"Error analyzing {filepath}: {e}")
         return None
 
 
+def _parse_file_safe(path_str: str) -> Optional[dict]:
+    """_parse_file for worker processes: logs and returns None instead of raising."""
+    try:
+        return _parse_file(path_str)
+    except Exception as e:
+        logger.error(f"Error analyzing {path_str}: {e}")
+        return None
+
+
+def _parse_file(path_str: str) -> dict:
+    """
+    Parse a page source file and extract element identifiers.
+    """
+    tree = ET.parse(path_str)
+    root = tree.getroot()
+    
+    analysis = {
+        'resource_ids': set(),
+        'content_descriptions': Counter(),  # content-desc -> occurrences
+        'texts': set(),
+        'class_names': set(),
+        # Clickable elements stored column-wise (parallel lists, one entry per element)
+        'clickable_resource_ids': [],
+        'clickable_content_descs': [],
+        'clickable_texts': [],
+        'clickable_classes': []
+    }
+    
+    # Bind container methods once - they are called for nearly every element
+    add_resource_id = analysis['resource_ids'].add
+    content_desc_counts = analysis['content_descriptions']
+    add_text = analysis['texts'].add
+    add_class_name = analysis['class_names'].add
+    append_clickable_resource_id = analysis['clickable_resource_ids'].append
+    append_clickable_content_desc = analysis['clickable_content_descs'].append
+    append_clickable_text = analysis['clickable_texts'].append
+    append_clickable_class = analysis['clickable_classes'].append
+    
+    # Extract all element information in a single pass
+    for elem in root.iter():
+        get = elem.get
+        # Class names and resource IDs repeat across thousands of nodes - intern them so every
+        # occurrence shares one string object (cheaper set/merge hashing, one copy when pickled)
+        resource_id = sys.intern(get('resource-id', ''))
+        content_desc = get('content-desc', '')
+        text = get('text', '')
+        class_name = sys.intern(get('class', ''))
+        
+        if resource_id:
+            add_resource_id(resource_id)
+        if content_desc:
+            content_desc_counts[content_desc] += 1
+        if text:
+            add_text(text)
+        if class_name:
+            add_class_name(class_name)
+        
+        if get('clickable') == 'true':
+            append_clickable_resource_id(resource_id)
+            append_clickable_content_desc(content_desc)
+            append_clickable_text(text)
+            append_clickable_class(class_name)
+    
+    return analysis
+
+
 def analyze_all_page_sources(page_sources_dir: str = "page_sources") -> dict:
     """
     Analyze all saved page source files and group by action type.
@@ -97,35 +165,70 @@ def analyze_all_page_sources(page_sources_dir: str = "page_sources") -> dict:
     
     logger.info(f"Found {len(action_groups)} different action types")
     
-    # Analyze each group
-    results = {}
+    # Parse the first 5 files of each type - files are independent, so spread them across processes
+    flat = [(action_name, filepath) for action_name, filepaths in action_groups.items() for filepath in filepaths[:5]]
     for action_name, filepaths in action_groups.items():
-        logger.info(f"Analyzing {len(filepaths)} files for action: {action_name}")
+        logger.info(f"Analyzing {len(filepaths[:5])} of {len(filepaths)} files for action: {action_name}")
+    
+    # Cache lookups happen here in the parent - only files not parsed before go to the workers
+    analyses = []
+    misses = []  # (index into analyses, cache key)
+    for _, filepath in flat:
+        try:
+            key = _cache_key(filepath)
+        except OSError as e:
+            logger.error(f"Error analyzing {filepath}: {e}")
+            analyses.append(None)
+            continue
+        analysis = _PARSE_CACHE.get(key)
+        if analysis is None:
+            misses.append((len(analyses), key))
+        analyses.append(analysis)
+    
+    miss_paths = [key[0] for _, key in misses]
+    if len(miss_paths) > 1:
+        max_workers = min(len(miss_paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parsed = list(executor.map(_parse_file_safe, miss_paths))
+    else:
+        parsed = [_parse_file_safe(path_str) for path_str in miss_paths]
+    for (index, key), analysis in zip(misses, parsed):
+        analyses[index] = analysis
+        if analysis is not None:
+            _remember(key, analysis)
+    
+    # Regroup parsed files by action type
+    analyses_by_action = defaultdict(list)
+    for (action_name, _), analysis in zip(flat, analyses):
+        if analysis:
+            analyses_by_action[action_name].append(analysis)
+    
+    # Merge each group
+    results = {}
+    for action_name, all_analyses in analyses_by_action.items():
+        # Merge analyses
+        merged = {
+            'resource_ids': set(),
+            'content_descriptions': Counter(),  # Summed across files - frequency for free
+            'texts': set(),
+            'class_names': set(),
+            'clickable_resource_ids': [],
+            'clickable_content_descs': [],
+            'clickable_texts': [],
+            'clickable_classes': []
+        }
         
-        all_analyses = []
-        for filepath in filepaths[:5]:  # Analyze first 5 files of each type
-            analysis = analyze_page_source_file(filepath)
-            if analysis:
-                all_analyses.append(analysis)
+        for analysis in all_analyses:
+            merged['resource_ids'].update(analysis['resource_ids'])
+            merged['content_descriptions'].update(analysis['content_descriptions'])
+            merged['texts'].update(analysis['texts'])
+            merged['class_names'].update(analysis['class_names'])
+            merged['clickable_resource_ids'].extend(analysis['clickable_resource_ids'])
+            merged['clickable_content_descs'].extend(analysis['clickable_content_descs'])
+            merged['clickable_texts'].extend(analysis['clickable_texts'])
+            merged['clickable_classes'].extend(analysis['clickable_classes'])
         
-        if all_analyses:
-            # Merge analyses
-            merged = {
-                'resource_ids': set(),
-                'content_descriptions': set(),
-                'texts': set(),
-                'class_names': set(),
-                'clickable_elements': []
-            }
-            
-            for analysis in all_analyses:
-                merged['resource_ids'].update(analysis['resource_ids'])
-                merged['content_descriptions'].update(analysis['content_descriptions'])
-                merged['texts'].update(analysis['texts'])
-                merged['class_names'].update(analysis['class_names'])
-                merged['clickable_elements'].extend(analysis['clickable_elements'])
-            
-            results[action_name] = merged
+        results[action_name] = merged
     
     return results
 
@@ -157,34 +260,34 @@ def identify_screen_indicators(analysis_results: dict) -> dict:
             swipe_elements.update(data['resource_ids'])
             swipe_elements.update(data['texts'])
             
-            # Look for like-related elements (most reliable indicator)
-            for content_desc in data['content_descriptions']:
-                if 'like' in content_desc.lower() and content_desc.strip():
-                    screen_indicators['swipe']['content_descs'].append(content_desc)
-            
-            # Look for swipe-related elements
+            # Look for like-related (most reliable indicator) and swipe-related elements
             for content_desc in data['content_descriptions']:
-                if 'swipe' in content_desc.lower() and content_desc.strip():
+                desc_lower = content_desc.lower()
+                if ('like' in desc_lower or 'swipe' in desc_lower) and content_desc.strip():
                     screen_indicators['swipe']['content_descs'].append(content_desc)
             
             # Extract resource IDs that might be swipe screen indicators
             for resource_id in data['resource_ids']:
-                if resource_id and 'doubble' in resource_id.lower():
-                    if any(keyword in resource_id.lower() for keyword in ['swipe', 'like', 'card', 'profile', 'match']):
-                        screen_indicators['swipe']['ids'].append(resource_id)
+                rid_lower = resource_id.lower()
+                if 'doubble' not in rid_lower:  # Cheap prefilter - skips system/third-party IDs
+                    continue
+                if any(keyword in rid_lower for keyword in _SWIPE_ID_KEYWORDS):
+                    screen_indicators['swipe']['ids'].append(resource_id)
             
             # Look for clickable elements that might be buttons
-            for elem in data['clickable_elements']:
-                if elem.get('content_desc') and 'like' in elem['content_desc'].lower():
-                    screen_indicators['swipe']['content_descs'].append(elem['content_desc'])
-                if elem.get('resource_id') and 'doubble' in elem['resource_id'].lower():
-                    if any(kw in elem['resource_id'].lower() for kw in ['like', 'swipe', 'button']):
-                        screen_indicators['swipe']['ids'].append(elem['resource_id'])
-    
-    # Remove duplicates and keep unique values
+            for content_desc, resource_id in zip(data['clickable_content_descs'], data['clickable_resource_ids']):
+                if content_desc and 'like' in content_desc.lower():
+                    screen_indicators['swipe']['content_descs'].append(content_desc)
+                rid_lower = resource_id.lower()
+                if 'doubble' not in rid_lower:
+                    continue
+                if any(kw in rid_lower for kw in _SWIPE_BUTTON_ID_KEYWORDS):
+                    screen_indicators['swipe']['ids'].append(resource_id)
+    
+    # Remove duplicates and keep unique values (sorted so repeated runs produce identical output)
     for screen_type in screen_indicators:
         for key in screen_indicators[screen_type]:
-            screen_indicators[screen_type][key] = list(set(screen_indicators[screen_type][key]))
+            screen_indicators[screen_type][key] = sorted(set(screen_indicators[screen_type][key]))
     
     return screen_indicators
 
@@ -231,13 +334,20 @@ def update_screen_detection_code(screen_indicators: dict, output_file: str = "pa
         logger.warning("No new swipe indicators found - keeping existing ones")
         return False
     
-    # Find and replace SWIPE_SCREEN_INDICATORS
-    pattern = r'(SWIPE_SCREEN_INDICATORS = \[)(.*?)(\])'
+    # Find and replace SWIPE_SCREEN_INDICATORS (plain index search + slice - no regex backtracking).
+    # The list ends at its own closing bracket line, not at the first ']' (XPaths contain brackets).
+    new_swipe_indicators = _SWIPE_INDICATORS_START + '\n' + '\n'.join(swipe_indicators) + _SWIPE_INDICATORS_END
     
-    new_swipe_indicators = 'SWIPE_SCREEN_INDICATORS = [\n' + '\n'.join(swipe_indicators) + '\n    ]'
+    start = content.find(_SWIPE_INDICATORS_START)
+    end = content.find(_SWIPE_INDICATORS_END, start) if start >= 0 else -1
     
-    if re.search(pattern, content, re.DOTALL):
-        content = re.sub(pattern, new_swipe_indicators, content, flags=re.DOTALL)
+    if end >= 0:
+        # Skip the rewrite when the analysis has converged on the indicators already in the file
+        if content[start:end + len(_SWIPE_INDICATORS_END)] == new_swipe_indicators:
+            logger.info(f"✓ {output_file} already uses these {len(swipe_indicators)} indicators - no update needed")
+            return True
+        
+        content = content[:start] + new_swipe_indicators + content[end + len(_SWIPE_INDICATORS_END):]
         filepath.write_text(content, encoding='utf-8')
         logger.info(f"✓ Updated {output_file} with {len(swipe_indicators)} real indicators")
         logger.info("The code now uses actual identifiers from your app!")
@@ -262,19 +372,16 @@ def ai_analyze_patterns(analysis_results: dict) -> dict:
     
     # For swipe screen: look for elements that appear consistently
     swipe_actions = ['like_button_click', 'swipe_right']
-    common_swipe_elements = {}
+    common_swipe_elements = Counter()
     
     for action in swipe_actions:
         if action in analysis_results:
-            data = analysis_results[action]
-            # Count frequency of elements
-            for content_desc in data['content_descriptions']:
-                if content_desc:
-                    common_swipe_elements[content_desc] = common_swipe_elements.get(content_desc, 0) + 1
+            # Frequencies were already counted while parsing - just combine them
+            common_swipe_elements.update(analysis_results[action]['content_descriptions'])
     
     # Prioritize most common elements
     if common_swipe_elements:
-        most_common = sorted(common_swipe_elements.items(), key=lambda x: x[1], reverse=True)
+        most_common = sorted(common_swipe_elements.items(), key=itemgetter(1), reverse=True)
         logger.info(f"Most common elements on swipe screen: {most_common[:5]}")
         
         # Add most common to indicators
@@ -1,24 +1,47 @@
 import sys
+import atexit
 import os
+import re
 import time
+import random
 import signal
 import socket
+import http.client
+import json
+import queue
 import subprocess
 import shutil
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from collections import deque
+from typing import Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from urllib3.exceptions import NewConnectionError, MaxRetryError
 from requests.exceptions import ConnectionError as RequestsConnectionError
-from selenium.common.exceptions import WebDriverException
+from selenium.common.exceptions import WebDriverException, InvalidSessionIdException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from appium.webdriver.common.appiumby import AppiumBy
+try:
+    # lxml evaluates compiled XPath queries against one page-source snapshot (optional -
+    # without it screen detection probes the device element by element)
+    from lxml import etree
+except ImportError:
+    etree = None
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from drivers import DriverFactory, get_driver, close_driver
-from pages.base_page import BasePage
+from drivers.driver_factory import _appium_address, _appium_status_path
+from pages.base_page import BasePage, _resolve_by
 from pages.doubble_screens import DoubbleScreenDetector
 from pages.doubble_swipe_page import DoubbleSwipePage
 import logging
+from logging.handlers import QueueHandler, QueueListener
 
 # Setup basic logging
 logging.basicConfig(
@@ -27,8 +50,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def start_log_listener():
+    """
+    Move the root logger's handlers onto a background QueueListener thread.
+    
+    OPTIMIZED: Logging calls in the startup/swipe loops then only enqueue the record
+    instead of writing to the console synchronously. The listener is flushed at exit.
+    """
+    root_logger = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root_logger.handlers):
+        return  # Already started
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *root_logger.handlers, respect_handler_level=True)
+    root_logger.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+
+
 # Global flag for graceful shutdown
 running = True
+# Set on Ctrl+C / SIGTERM - error-path waits in the swipe loop use shutdown_event.wait() so a
+# stop request interrupts them immediately instead of after the current sleep + retry cycle
+shutdown_event = threading.Event()
+# True while swipe_and_like_loop runs - the signal handler then only requests a graceful stop
+_swipe_loop_active = False
+
+# Stop the swipe loop after this many connection errors in a row
+MAX_CONSECUTIVE_ERRORS = 5
 
 # Connection error types to catch
 CONNECTION_ERRORS = (
@@ -47,11 +96,205 @@ UIAUTOMATOR2_CRASH_INDICATORS = [
     "proxyCommand",
 ]
 
+# Error classifiers compiled once - a single case-insensitive regex search per error
+# instead of lowercasing the message and scanning it once per indicator
+_CRASH_RE = re.compile('|'.join(map(re.escape, UIAUTOMATOR2_CRASH_INDICATORS)), re.IGNORECASE)
+_DOWN_RE = re.compile(r'connection refused|actively refused|10061', re.IGNORECASE)
+# Exception types that by themselves mean the Appium server cannot be reached
+_SERVER_DOWN_ERRORS = (NewConnectionError, MaxRetryError, ConnectionRefusedError)
+
+# Locators used on every navigation attempt / loop iteration - built once at import.
+# ULTRA-FAST: Screen-detection probes are UiAutomator selectors - evaluated natively by the
+# UiAutomator2 server instead of dumping the whole page source for an XPath query.
+# Case-insensitive matches use one (?i) regex instead of a 'Like' or 'like' pair.
+LIKE_SELECTOR = 'new UiSelector().descriptionMatches("(?i).*like.*")'
+# Swipe / Discover / Explore indicators OR'd into one regex - one query instead of three
+SWIPE_INDICATOR_SELECTOR = 'new UiSelector().descriptionMatches("(?i).*(swipe|discover|explore).*")'
+# Activity names that identify the screen on their own (checked before any element probe);
+# ambiguous ones such as .MainActivity fall through to the element checks
+DEFINITIVE_ACTIVITY_SCREENS = (
+    (".LoginActivity", "login"),
+    (".SwipeActivity", "swipe"),
+    (".DiscoverActivity", "swipe"),
+)
+# XPath twins of the probes above, compiled once and evaluated locally against a single
+# page-source snapshot per detection round
+LIKE_XPATH = "//*[contains(translate(@content-desc, 'LIKE', 'like'), 'like')]"
+_LOWERED_DESC = "translate(@content-desc, 'SWIPEDCOVRXL', 'swipedcovrxl')"
+SWIPE_INDICATOR_XPATH = (
+    f"//*[contains({_LOWERED_DESC}, 'swipe') or contains({_LOWERED_DESC}, 'discover')"
+    f" or contains({_LOWERED_DESC}, 'explore')]"
+)
+if etree is not None:
+    _LIKE_QUERY = etree.XPath(LIKE_XPATH)
+    _SWIPE_INDICATOR_QUERY = etree.XPath(SWIPE_INDICATOR_XPATH)
+else:
+    _LIKE_QUERY = _SWIPE_INDICATOR_QUERY = None
+SWIPE_BUTTON_LOCATORS = (
+    ("id", "dk.doubble.dating:id/swipe"),
+    ("id", "dk.doubble.dating:id/swipe_button"),
+    ("id", "dk.doubble.dating:id/btn_swipe"),
+    ("accessibility_id", "Swipe"),
+    ("accessibility_id", "swipe"),
+    ("xpath", "//*[contains(translate(@content-desc, 'SWIPE', 'swipe'), 'swipe') or contains(translate(@text, 'SWIPE', 'swipe'), 'swipe')]"),
+)
+
+# Messaging screens: one native UiAutomator2 query per step instead of a loop of XPath/id probes.
+# ';' separates alternative selectors - UiAutomator2 tries them in order within the same request,
+# so they are ordered resource-id -> content-desc -> text: the most specific (and, when present,
+# the most reliable) match wins early and the broad text regexes only run as a last resort.
+LIKES_MATCHES_SELECTOR = (
+    'new UiSelector().resourceIdMatches(".*:id/(likes|matches)");'
+    'new UiSelector().descriptionMatches("(?i).*likes.*");'
+    'new UiSelector().descriptionMatches("(?i).*matches.*");'
+    'new UiSelector().textMatches("(?i).*likes.*");'
+    'new UiSelector().textMatches("(?i).*matches.*")'
+)
+MATCHED_TAB_SELECTOR = (
+    'new UiSelector().resourceIdMatches(".*:id/(tab_)?matched");'
+    'new UiSelector().descriptionMatches("(?i).*matched.*");'
+    'new UiSelector().textMatches("(?i).*matched.*");'
+    'new UiSelector().textContains("Matches")'
+)
+CHAT_BUTTON_SELECTOR = (
+    'new UiSelector().resourceIdMatches(".*:id/(message|chat|btn_message)");'
+    'new UiSelector().descriptionMatches("(?i).*(message|chat).*");'
+    'new UiSelector().textMatches("(?i).*(message|chat).*")'
+)
+MESSAGES_TAB_SELECTOR = (
+    'new UiSelector().resourceIdMatches(".*:id/(messages|chats|tab_messages)");'
+    'new UiSelector().descriptionMatches("(?i).*(messages|chat).*");'
+    'new UiSelector().textMatches("(?i).*(messages|chat).*")'
+)
+MESSAGE_INPUT_SELECTOR = 'new UiSelector().className("android.widget.EditText")'
+SEND_BUTTON_SELECTOR = (
+    'new UiSelector().resourceIdMatches(".*(send|btn_send).*").clickable(true);'
+    'new UiSelector().descriptionMatches("(?i).*send.*");'
+    'new UiSelector().textContains("Send")'
+)
+# Match / conversation list - its presence means a tab switch has finished rendering
+LIST_LOCATOR = (AppiumBy.CLASS_NAME, "androidx.recyclerview.widget.RecyclerView")
+
+
+def _with_log_value(locators, width: int = 50) -> tuple:
+    """Freeze (locator_type, locator_value) pairs into (type, value, value truncated for logging) triples."""
+    return tuple((locator_type, locator_value, locator_value[:width]) for locator_type, locator_value in locators)
+
+
+# First-row fallbacks for the match and conversation lists - frozen at import instead of
+# rebuilt on every call. UiAutomator2 selectors walk the accessibility tree natively and stop
+# at the indexed match - no whole-hierarchy XML serialization like //*[contains(@class, ...)] XPaths.
+MATCH_LOCATORS = _with_log_value((
+    ("android_uiautomator", 'new UiSelector().className("androidx.recyclerview.widget.RecyclerView").childSelector(new UiSelector().clickable(true).instance(0))'),
+    ("android_uiautomator", 'new UiSelector().classNameMatches(".*(Card|card|Match).*").clickable(true)'),
+    ("android_uiautomator", 'new UiSelector().descriptionContains("match").clickable(true)'),
+    ("android_uiautomator", 'new UiSelector().classNameMatches(".*RecyclerView").childSelector(new UiSelector().clickable(true).instance(0))'),
+))
+CONVERSATION_LOCATORS = _with_log_value((
+    ("android_uiautomator", 'new UiSelector().className("androidx.recyclerview.widget.RecyclerView").childSelector(new UiSelector().clickable(true).instance(0))'),
+    ("android_uiautomator", 'new UiSelector().classNameMatches(".*RecyclerView").childSelector(new UiSelector().clickable(true).instance(0))'),
+    ("android_uiautomator", 'new UiSelector().classNameMatches(".*(Conversation|Chat).*").clickable(true)'),
+))
+# Messages screen component for a direct jump (confirm with:
+#   adb shell dumpsys activity activities | findstr mResumedActivity  - while the Messages tab is open)
+MESSAGES_ACTIVITY = "dk.doubble.dating/.ui.MessagesActivity"
+# The activity name above is unverified - in-app navigation stays the default until it has
+# been confirmed on a device
+USE_MESSAGES_JUMP = False
+# UiAutomator2 session settings: a smaller page-source snapshot makes every XPath fallback cheaper.
+# Only attributes no locator in this project reads are excluded (content-desc/text/class are kept).
+DRIVER_SETTINGS = {
+    'pageSourceExcludedAttributes': 'visible,hint,long-clickable',
+    'snapshotMaxDepth': 30,
+    'allowInvisibleElements': False,
+}
+
+# Device-side boot wait: loops inside the device shell (one adb connection) until boot has finished
+BOOT_WAIT_SCRIPT = (
+    'while [ "$(getprop sys.boot_completed)" != "1" ] || [ "$(getprop dev.bootcomplete)" != "1" ]'
+    ' || [ "$(getprop init.svc.bootanim)" != "stopped" ]; do sleep 1; done'
+)
+BOOT_PROPS_SCRIPT = "getprop sys.boot_completed; echo ---; getprop dev.bootcomplete; echo ---; getprop init.svc.bootanim"
+# Device-side app launch: launcher intent, then monkey, then the launcher activity resolved by
+# PackageManager (common activity names only if it cannot be resolved, e.g. Android < 7).
+# Stops at the first method that works and prints its name (exit code 1 = nothing worked)
+APP_LAUNCH_SCRIPT = (
+    'am start -a android.intent.action.MAIN -c android.intent.category.LAUNCHER dk.doubble.dating 2>&1'
+    ' | grep -q Error || { echo "launcher intent"; exit 0; }; '
+    'monkey -p dk.doubble.dating -c android.intent.category.LAUNCHER 1 >/dev/null 2>&1 && { echo "monkey"; exit 0; }; '
+    'a=$(cmd package resolve-activity --brief -c android.intent.category.LAUNCHER dk.doubble.dating 2>/dev/null | tail -n 1); '
+    'case "$a" in */*) set -- "${a#*/}";; *) set -- .MainActivity .ui.MainActivity .SplashActivity .LaunchActivity;; esac; '
+    'for a in "$@"; do '
+    'am start -n dk.doubble.dating/$a 2>&1 | grep -qE "Error|does not exist" || { echo "activity $a"; exit 0; }; '
+    'done; exit 1'
+)
+
+# Hide console windows of spawned tools on Windows (the flag does not exist elsewhere)
+_CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# Manual-recovery hints shown when the emulator/device cannot be brought up automatically
+_MANUAL_START_HINT = '  powershell -Command "& \'$env:LOCALAPPDATA\\Android\\Sdk\\emulator\\emulator.exe\' -avd %s"'
+_MANUAL_DEVICES_HINT = '  powershell -Command "& \'$env:LOCALAPPDATA\\Android\\Sdk\\platform-tools\\adb.exe\' devices"'
+
+# Startup banner - logged with a single call instead of one logger.info per line
+_ACTION_PLAN = """\
+
+============================================================
+CONFIGURATION
+============================================================
+Number of swipes: 5
+New matches to message: 1
+Existing conversations to message: 1
+Message to send: 'Hey! How are you?'
+Swipe speed: Ultra-fast (200ms duration)
+Pop-up checks: Every 16 iterations
+Connection recovery: Enabled
+
+============================================================
+ACTION PLAN - Doubble Automation
+============================================================
+
+PHASE 1: SWIPING (5 swipes)
+  Step 1.1: Detect current screen
+  Step 1.2: Navigate to swipe screen (if needed)
+  Step 1.3: Perform 5 right swipes (like gestures)
+           - Each swipe: ~0.3 seconds
+           - Total time: ~1.5 seconds
+
+PHASE 2A: NEW MATCH MESSAGING (1 match)
+  Step 2.1: Navigate to Likes/Matches section
+  Step 2.2: Click on 'Matched' tab (recent matches)
+  Step 2.3: Click on the first/recent match
+  Step 2.4: Scroll down on match profile (2 swipes)
+  Step 2.5: Find and click 'Private Chat' / 'Message' button
+  Step 2.6: Find message input field
+  Step 2.7: Type message: 'Hey! How are you?'
+  Step 2.8: Click 'Send' button or press Enter
+
+PHASE 2B: EXISTING CONVERSATION MESSAGING (1 conversation)
+  Step 3.1: Navigate back to Likes/Matches section
+  Step 3.2: Click on 'Messages' or 'Chats' tab
+  Step 3.3: Click on the first existing conversation
+  Step 3.4: Find message input field
+  Step 3.5: Type message: 'Hey! How are you?'
+  Step 3.6: Click 'Send' button or press Enter
+
+============================================================
+Initializing Appium driver...
+============================================================
+"""
+
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully."""
     global running
     logger.info("\nReceived interrupt signal. Stopping gracefully...")
     running = False
+    if _swipe_loop_active and not shutdown_event.is_set():
+        # Let the loop exit on its own; main()'s finally block does the cleanup.
+        # A second Ctrl+C falls through to the immediate shutdown below.
+        shutdown_event.set()
+        return
+    shutdown_event.set()
     close_driver()
     stop_appium_server()
     sys.exit(0)
@@ -60,6 +303,12 @@ signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
 
+@lru_cache(maxsize=64)
+def _classify_server_down(signature: str) -> bool:
+    """Regex classification of an error signature, memoized - error storms repeat the same few messages."""
+    return _DOWN_RE.search(signature) is not None
+
+
 def is_appium_server_down(error) -> bool:
     """
     Check if the error indicates Appium server is completely down (not just UiAutomator2 crash).
@@ -70,11 +319,12 @@ def is_appium_server_down(error) -> bool:
     Returns:
         bool: True if Appium server appears to be down
     """
-    error_str = str(error).lower()
-    # Check for connection refused errors (server not running)
-    if "connection refused" in error_str or "actively refused" in error_str or "10061" in error_str:
+    # OPTIMIZED: Connection-level exceptions mean the server is down - no need to stringify them
+    if isinstance(error, _SERVER_DOWN_ERRORS):
         return True
-    return False
+    # Check for connection refused errors (server not running). The full message is part of the
+    # key - truncating it could drop an indicator that appears after a long "Message: ..." prefix.
+    return _classify_server_down(f"{type(error).__name__}:{error}")
 
 
 def run_powershell_command(command: str, timeout: int = 10) -> tuple:
@@ -96,7 +346,7 @@ def run_powershell_command(command: str, timeout: int = 10) -> tuple:
             text=True,
             timeout=timeout,
             shell=False,
-            creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+            creationflags=_CREATE_NO_WINDOW
         )
         return (result.returncode == 0, result.stdout, result.stderr)
     except subprocess.TimeoutExpired:
@@ -107,26 +357,489 @@ def run_powershell_command(command: str, timeout: int = 10) -> tuple:
         return (False, "", str(e))
 
 
+# One `adb devices [-l]` entry: device ID, then its state (tab- or space-separated)
+_ADB_DEVICES_RE = re.compile(r'^(\S+)\s+(device|offline|unauthorized)\b', re.MULTILINE)
+
+
+def parse_ready_device(devices_output: str):
+    """
+    Return the ID of the first ready device in `adb devices [-l]` output.
+    
+    Handles both the tab-separated plain format and the space-padded `-l` format
+    (e.g. "emulator-5554          device product:sdk_gphone64 model:...").
+    
+    Args:
+        devices_output: stdout of `adb devices` / `adb devices -l`
+        
+    Returns:
+        str or None: Device ID whose state is "device", or None if no device is ready
+    """
+    # OPTIMIZED: One compiled regex scan instead of splitting every line (the
+    # "List of devices attached" header never matches)
+    for match in _ADB_DEVICES_RE.finditer(devices_output):
+        if match.group(2) == 'device':
+            return match.group(1)
+    return None
+
+
+@lru_cache(maxsize=1)
+def _resolve_adb_path() -> Optional[Path]:
+    """
+    Find adb.exe (Android SDK platform-tools first, then LDPlayer).
+    
+    OPTIMIZED: The resolved path is published in the DOUBBLE_ADB_PATH environment variable,
+    which is checked first - set it persistently (or inherit it from a launcher script) to
+    skip the candidate probing entirely on later runs. Within a run the result is memoized.
+    
+    Returns:
+        Path: Path to adb.exe, or None if it is not installed at a known location
+    """
+    env_path = os.environ.get('DOUBBLE_ADB_PATH')
+    if env_path and Path(env_path).exists():
+        return Path(env_path)
+    for candidate in (
+        Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "platform-tools" / "adb.exe",
+        Path("C:/LDPlayer/LDPlayer9/adb.exe"),
+    ):
+        if candidate.exists():
+            os.environ['DOUBBLE_ADB_PATH'] = str(candidate)
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=1)
+def _resolve_emulator_path() -> Optional[Path]:
+    """
+    Find the Android SDK emulator.exe (memoized for the run).
+    
+    Returns:
+        Path: Path to emulator.exe, or None if the SDK emulator is not installed
+    """
+    candidate = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "emulator" / "emulator.exe"
+    return candidate if candidate.exists() else None
+
+
+class PersistentAdbShell:
+    """
+    One long-lived `adb shell` session that commands are piped into.
+    
+    OPTIMIZED: Every `subprocess.run([adb, "shell", ...])` pays a process spawn plus a fresh
+    adbd session; piping commands into one open shell pays that cost once. The session is
+    started lazily on the first run() and restarted automatically if it dies or times out.
+    """
+    
+    END_MARKER = "__END__"
+    
+    def __init__(self, adb_path: Path):
+        """
+        Args:
+            adb_path: Path to adb.exe
+        """
+        self.adb_path = adb_path
+        self._process = None
+        self._lines = None
+    
+    def _start(self):
+        """Spawn the shell and a reader thread that queues its output lines."""
+        self._process = subprocess.Popen(
+            [str(self.adb_path), "shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            creationflags=_CREATE_NO_WINDOW
+        )
+        self._lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self._process.stdout, self._lines), daemon=True).start()
+    
+    @staticmethod
+    def _pump(stream, lines):
+        """Reader thread: forward every output line, then None once the shell exits."""
+        for line in stream:
+            lines.put(line)
+        lines.put(None)
+    
+    def run(self, command: str, timeout: float = 5) -> Tuple[int, str]:
+        """
+        Run a shell command in the persistent session.
+        
+        The command runs in a subshell, so scripts may use `exit` without ending the session.
+        
+        Args:
+            command: Shell command line to run on the device
+            timeout: Maximum seconds to wait for the command to finish
+            
+        Returns:
+            tuple: (exit code, combined stdout/stderr output)
+            
+        Raises:
+            subprocess.TimeoutExpired: If the command did not finish in time (the session is closed)
+            OSError: If the shell session ended unexpectedly
+        """
+        if self._process is None or self._process.poll() is not None:
+            self._start()
+        self._process.stdin.write(f"( {command} ); echo {self.END_MARKER}$?\n")
+        self._process.stdin.flush()
+        
+        deadline = time.monotonic() + timeout
+        output = []
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self.close()
+                raise subprocess.TimeoutExpired(command, timeout)
+            if line is None:
+                self._process = None
+                raise OSError("adb shell session ended")
+            # The marker can follow output that did not end with a newline
+            marker_pos = line.rfind(self.END_MARKER)
+            if marker_pos != -1:
+                output.append(line[:marker_pos])
+                return int(line[marker_pos + len(self.END_MARKER):].strip() or 1), ''.join(output)
+            output.append(line)
+    
+    def close(self):
+        """Terminate the shell session (a later run() starts a new one)."""
+        if self._process is not None:
+            try:
+                self._process.kill()
+                self._process.wait(timeout=2)
+            except Exception:
+                pass
+            self._process = None
+
+
+def wait_for_foreground(adb_shell: PersistentAdbShell, package: str = "dk.doubble.dating",
+                        timeout: float = 3.0, interval: float = 0.1) -> bool:
+    """
+    Wait until an app's window has focus.
+    
+    OPTIMIZED: Replaces the fixed sleep(3) after a launch - the poll runs on the device
+    (one shell round-trip) and returns as soon as the window is focused.
+    
+    Args:
+        adb_shell: Persistent adb shell session
+        package: Package whose window should be focused
+        timeout: Maximum seconds to wait
+        interval: Seconds between focus checks
+        
+    Returns:
+        bool: True if the app came to the foreground within the timeout
+    """
+    checks = max(1, int(timeout / interval))
+    script = (
+        f"for i in $(seq {checks}); do "
+        f"dumpsys window | grep -E 'mCurrentFocus|mFocusedApp' | grep -q {package} && exit 0; "
+        f"sleep {interval}; done; exit 1"
+    )
+    try:
+        rc, _ = adb_shell.run(script, timeout=timeout + 2)
+        return rc == 0
+    except Exception as e:
+        logger.debug("Foreground check error: %s", e)
+        return False
+
+
+# "package/activity" component inside a dumpsys ActivityRecord{... u0 pkg/.Activity t12} line
+_RESUMED_ACTIVITY_RE = re.compile(r'\s([\w.]+)/([\w.$]+)')
+
+
+def get_foreground_app(adb_shell: PersistentAdbShell) -> Optional[Tuple[str, str]]:
+    """
+    Read the resumed (foreground) package and activity with one shell command.
+    
+    OPTIMIZED: One dumpsys round-trip on the persistent shell replaces the
+    get_current_package() + get_current_activity() pair of Appium requests.
+    
+    Args:
+        adb_shell: Persistent adb shell session
+        
+    Returns:
+        tuple: (package, activity), or None if it could not be determined
+    """
+    try:
+        _, output = adb_shell.run(
+            "dumpsys activity activities | grep -E 'mResumedActivity|topResumedActivity' | head -n 1",
+            timeout=2
+        )
+    except Exception as e:
+        logger.debug("Foreground app check error: %s", e)
+        return None
+    match = _RESUMED_ACTIVITY_RE.search(output)
+    return (match.group(1), match.group(2)) if match else None
+
+
+def page_source_snapshot(driver):
+    """
+    Fetch the page source once and parse it for local XPath evaluation.
+    
+    Args:
+        driver: Appium WebDriver instance
+        
+    Returns:
+        lxml root element, or None if lxml is not installed or the fetch/parse failed
+    """
+    if etree is None:
+        return None
+    try:
+        return etree.fromstring(driver.page_source.encode('utf-8'))
+    except Exception as e:
+        logger.debug("Page source snapshot failed: %s", e)
+        return None
+
+
+class TreeCache:
+    """
+    Short-lived cache of the parsed page source shared by consecutive UI checks.
+    
+    Detection, the initial pop-up check and the navigation entry check all look at the
+    same screen within a fraction of a second - they share one page_source fetch instead
+    of each paying its own round trip. Call invalidate() after any tap or gesture.
+    """
+    
+    def __init__(self, driver, ttl: float = 0.25):
+        """
+        Args:
+            driver: Appium WebDriver instance
+            ttl: Seconds a fetched tree stays valid
+        """
+        self.driver = driver
+        self.ttl = ttl
+        self._root = None
+        self._fetched_at = None
+    
+    def root(self):
+        """
+        Get the parsed page source, fetching it only when the cached one is stale.
+        
+        Returns:
+            lxml root element, or None if lxml is not installed or the fetch failed
+        """
+        now = time.monotonic()
+        if self._fetched_at is None or now - self._fetched_at >= self.ttl:
+            self._root = page_source_snapshot(self.driver)
+            self._fetched_at = now
+        return self._root
+    
+    def invalidate(self):
+        """Drop the cached tree (the screen changed)."""
+        self._root = None
+        self._fetched_at = None
+
+
+@contextmanager
+def _no_implicit(driver):
+    """
+    Disable the driver's implicit wait for a block of short, explicitly-timed probes.
+    
+    The implicit wait from settings.yaml otherwise stretches every "not present" probe
+    to its full duration. The previous value is restored on exit.
+    
+    Args:
+        driver: Appium WebDriver instance
+    """
+    old_implicit_wait = None
+    try:
+        old_implicit_wait = driver.timeouts.implicit_wait
+        driver.implicitly_wait(0)
+    except WebDriverException as e:
+        logger.debug("Could not disable implicit wait: %s", e)
+    try:
+        yield
+    finally:
+        if old_implicit_wait is not None:
+            try:
+                driver.implicitly_wait(old_implicit_wait)
+            except WebDriverException as e:
+                logger.debug("Could not restore implicit wait: %s", e)
+
+
+# Persistent keep-alive connection used by check_appium_server_reachable (created lazily).
+# Probes run from the main thread and the health-check workers - the lock serializes them.
+_health_conn = None
+_health_lock = threading.Lock()
+
+
+def _open_health_connection():
+    """
+    Open the keep-alive HTTP connection to Appium used for health probes.
+    
+    Returns:
+        http.client.HTTPConnection: Connected HTTP connection
+    """
+    host, port = _appium_address()
+    conn = http.client.HTTPConnection(host, port, timeout=1)
+    conn.connect()
+    # TCP keepalive so a dead peer is noticed within seconds while the connection is idle
+    conn.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 5)
+    return conn
+
+
 def check_appium_server_reachable() -> bool:
     """
-    Quick check if Appium server is reachable on port 4723.
+    Quick check if the configured Appium server is reachable (settings.yaml server_url).
+    
+    OPTIMIZED: Reuses one persistent HTTP connection and asks Appium's /status endpoint,
+    instead of a new TCP handshake + close per probe. This also verifies that Appium is
+    actually serving HTTP, not just that the port is bound. A /status answer that is slow
+    (Node busy, e.g. installing UiAutomator2) still counts as reachable once the TCP
+    connection is up.
     
     Returns:
         bool: True if server is reachable, False otherwise
     """
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)  # 1 second timeout
-        result = sock.connect_ex(('localhost', 4723))
-        sock.close()
-        return result == 0
-    except:
+    global _health_conn
+    
+    with _health_lock:
+        # Retry once on a fresh connection if a reused keep-alive connection was closed by the server
+        for _ in range(2):
+            reused = _health_conn is not None
+            try:
+                if not reused:
+                    _health_conn = _open_health_connection()
+            except OSError:
+                return False
+            try:
+                _health_conn.request('GET', _appium_status_path())
+                response = _health_conn.getresponse()
+                response.read()  # Drain the body so the connection can be reused
+                return response.status == 200
+            except socket.timeout:
+                # Connected but the answer is slow - the server is up, just busy
+                _health_conn.close()
+                _health_conn = None
+                return True
+            except (OSError, http.client.HTTPException):
+                _health_conn.close()
+                _health_conn = None
+                if not reused:
+                    return False
         return False
 
 
 # Global variable to store Appium process
 _appium_process = None
 
+# Log line Appium prints once its HTTP listener is up
+_APPIUM_READY_BANNER = b"Appium REST http interface listener started"
+
+
+def _drain_appium_output(process, ready_event, recent_lines):
+    """
+    Daemon thread target: drain Appium's output for the life of the process.
+    
+    Keeps Appium from ever blocking on a full output pipe, sets ready_event when the
+    "listener started" banner appears (or when the output ends, so waiters wake up on
+    exit too) and keeps the last lines in recent_lines for diagnostics.
+    
+    Args:
+        process: Appium subprocess.Popen with stdout piped
+        ready_event: threading.Event to set when Appium reports it is ready
+        recent_lines: collections.deque(maxlen=N) receiving the most recent output lines
+    """
+    try:
+        for line in iter(process.stdout.readline, b''):
+            recent_lines.append(line)
+            if not ready_event.is_set() and _APPIUM_READY_BANNER in line:
+                ready_event.set()
+    except (OSError, ValueError):
+        pass
+    finally:
+        ready_event.set()
+        # This thread owns the pipe - close it here, after EOF, so the FD is released
+        # without racing a blocked readline() from another thread
+        try:
+            process.stdout.close()
+        except OSError:
+            pass
+
+
+# Resolved Appium executable, remembered across runs
+_APPIUM_CACHE = Path.home() / '.doubble_automation' / 'appium_path'
+
+
+def _resolve_appium_command():
+    """
+    Find the Appium executable.
+    
+    OPTIMIZED: Uses the path cached by a previous run, then PATH and the usual npm install
+    locations. PowerShell (slow to start) is only spawned if all of those miss.
+    
+    Returns:
+        str: Path to the Appium executable, or None if not found
+    """
+    try:
+        cached = _APPIUM_CACHE.read_text(encoding='utf-8').strip()
+        if cached and os.access(cached, os.X_OK):
+            return cached
+    except OSError:
+        pass
+    
+    appium_cmd = shutil.which("appium")
+    if not appium_cmd:
+        candidates = []
+        if os.environ.get('APPDATA'):
+            candidates.append(os.path.join(os.environ['APPDATA'], 'npm', 'appium.cmd'))
+        if os.environ.get('ProgramFiles'):
+            candidates.append(os.path.join(os.environ['ProgramFiles'], 'nodejs', 'appium.cmd'))
+        appium_cmd = next((path for path in candidates if os.path.exists(path)), None)
+    
+    if not appium_cmd:
+        logger.warning("Appium command not found in PATH. Trying PowerShell to find Appium...")
+        # Try to find Appium using PowerShell (npm global packages)
+        ps_cmd = 'Get-Command appium -ErrorAction SilentlyContinue | Select-Object -ExpandProperty Source'
+        success, output, _ = run_powershell_command(ps_cmd, timeout=5)
+        if not (success and output.strip()):
+            return None
+        appium_cmd = output.strip()
+        logger.info(f"Found Appium via PowerShell: {appium_cmd}")
+    
+    try:
+        _APPIUM_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        _APPIUM_CACHE.write_text(appium_cmd, encoding='utf-8')
+    except OSError as e:
+        logger.debug("Could not cache Appium path: %s", e)
+    return appium_cmd
+
+
+# Screen the previous run ended on, remembered across runs
+_SCREEN_STATE = Path.home() / '.doubble_automation' / 'screen_state.json'
+SCREEN_STATE_MAX_AGE = 30  # Seconds a remembered screen is trusted
+
+
+def load_screen_state() -> Optional[str]:
+    """
+    Get the screen the previous run ended on, if that run ended recently.
+    
+    Returns:
+        str: Remembered screen name, or None if there is no recent state
+    """
+    try:
+        state = json.loads(_SCREEN_STATE.read_text(encoding='utf-8'))
+        if time.time() - float(state["ts"]) <= SCREEN_STATE_MAX_AGE:
+            return state["screen"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def save_screen_state(screen: str):
+    """
+    Remember the screen this run ended on for the next run.
+    
+    Args:
+        screen: Screen name ("swipe", "unknown", ...)
+    """
+    try:
+        _SCREEN_STATE.parent.mkdir(parents=True, exist_ok=True)
+        _SCREEN_STATE.write_text(json.dumps({"screen": screen, "ts": time.time()}), encoding='utf-8')
+    except OSError as e:
+        logger.debug("Could not save screen state: %s", e)
+
 
 def start_appium_server() -> bool:
     """
@@ -144,20 +857,12 @@ def start_appium_server() -> bool:
             return True
         
         # Check if Appium command is available
-        appium_cmd = shutil.which("appium")
+        appium_cmd = _resolve_appium_command()
         if not appium_cmd:
-            logger.warning("Appium command not found in PATH. Trying PowerShell to find Appium...")
-            # Try to find Appium using PowerShell (npm global packages)
-            ps_cmd = 'Get-Command appium -ErrorAction SilentlyContinue | Select-Object -ExpandProperty Source'
-            success, output, _ = run_powershell_command(ps_cmd, timeout=5)
-            if success and output.strip():
-                appium_cmd = output.strip()
-                logger.info(f"Found Appium via PowerShell: {appium_cmd}")
-            else:
-                logger.error("Appium command not found. Please install Appium:")
-                logger.error("  npm install -g appium")
-                logger.error("  or install via: npm install -g @appium/appium")
-                return False
+            logger.error("Appium command not found. Please install Appium:")
+            logger.error("  npm install -g appium")
+            logger.error("  or install via: npm install -g @appium/appium")
+            return False
         
         logger.info("=" * 60)
         logger.info("Starting Appium server automatically...")
@@ -165,75 +870,70 @@ def start_appium_server() -> bool:
         logger.info("")
         
         # Start Appium server in background
-        # Redirect stdout/stderr to pipes so it runs in background
+        # stderr is merged into the stdout pipe: one pipe (two FDs fewer than separate pipes),
+        # drained continuously by a background thread (see below)
         logger.info(f"Starting Appium process: {appium_cmd}")
         _appium_process = subprocess.Popen(
             [appium_cmd],
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             stdin=subprocess.DEVNULL,
-            creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+            creationflags=_CREATE_NO_WINDOW
         )
         
         logger.info("Waiting for Appium server to start (this may take 5 to 19 seconds)...")
         
-        # Wait for Appium to be ready (max 30 seconds)
+        # Wait for Appium to be ready (max 30 seconds).
+        # OPTIMIZED: Event-driven - a daemon thread drains Appium's output and signals the
+        # "listener started" banner the moment it is printed, instead of polling every 2s.
+        # The port is also re-checked every 0.5s in case the banner text ever changes.
         max_wait = 30
-        waited = 0
-        check_interval = 2
-        
-        while waited < max_wait:
-            time.sleep(check_interval)
-            waited += check_interval
+        start_time = time.monotonic()
+        deadline = start_time + max_wait
+        next_progress_log = start_time + 6
+        
+        ready_event = threading.Event()
+        recent_lines = deque(maxlen=100)
+        threading.Thread(
+            target=_drain_appium_output,
+            args=(_appium_process, ready_event, recent_lines),
+            name="appium-output",
+            daemon=True
+        ).start()
+        
+        while time.monotonic() < deadline:
+            banner_seen = ready_event.wait(timeout=0.5)
             
             # Check if process is still running
             poll_result = _appium_process.poll()
             if poll_result is not None:
                 # Process terminated
-                stdout, stderr = _appium_process.communicate()
                 logger.error("Appium server process terminated unexpectedly")
                 logger.error(f"Exit code: {poll_result}")
-                if stderr:
-                    error_msg = stderr.decode('utf-8', errors='ignore')
-                    logger.error(f"Error output: {error_msg[:1000]}")
-                if stdout:
-                    output_msg = stdout.decode('utf-8', errors='ignore')
-                    logger.error(f"Standard output: {output_msg[:1000]}")
+                if recent_lines:
+                    output_msg = b"".join(recent_lines).decode('utf-8', errors='ignore')
+                    logger.error(f"Appium output: {output_msg[-1000:]}")
                 _appium_process = None
                 return False
             
             # Check if server is reachable
             if check_appium_server_reachable():
-                # Double-check: wait a moment and verify again to ensure it's stable
-                time.sleep(1)
-                if check_appium_server_reachable():
-                    logger.info(f"[OK] Appium server started successfully! (took {waited} seconds)")
-                    logger.info("")
-                    return True
-                else:
-                    logger.debug("Server was reachable but became unreachable - continuing to wait...")
+                waited = time.monotonic() - start_time
+                logger.info(f"[OK] Appium server started successfully! (took {waited:.1f} seconds)")
+                logger.info("")
+                return True
+            if banner_seen:
+                logger.debug("Banner seen but server not answering yet - continuing to wait...")
+                time.sleep(0.05)
             
-            if waited % 6 == 0:  # Log every 6 seconds
-                logger.info(f"  Still waiting... ({waited}/{max_wait} seconds)")
-                # Log that process is still running
-                if _appium_process.poll() is None:
-                    logger.debug("  Appium process is still running...")
-        
-        # Timeout - try PowerShell as fallback
-        logger.warning(f"Timeout: Appium server did not start within {max_wait} seconds using subprocess")
-        logger.info("Attempting to start Appium using PowerShell as fallback...")
-        
-        # Try starting Appium using PowerShell Start-Job (more reliable on Windows)
-        ps_start_cmd = f'Start-Job -ScriptBlock {{ appium }} | Out-Null; Start-Sleep -Seconds 3; $test = Test-NetConnection -ComputerName localhost -Port 4723 -WarningAction SilentlyContinue -InformationLevel Quiet; if ($test) {{ Write-Output "READY" }} else {{ Write-Output "NOT_READY" }}'
-        success, output, _ = run_powershell_command(ps_start_cmd, timeout=10)
-        
-        if success and "READY" in output:
-            logger.info("[OK] Appium server started successfully using PowerShell!")
-            logger.info("Note: Appium is running in a PowerShell background job")
-        return True
+            if time.monotonic() >= next_progress_log:  # Log every 6 seconds
+                next_progress_log += 6
+                logger.info(f"  Still waiting... ({int(time.monotonic() - start_time)}/{max_wait} seconds)")
         
-        logger.error("Appium server failed to start using both methods")
+        logger.error(f"Timeout: Appium server did not start within {max_wait} seconds")
         logger.error("Please start Appium manually or check for errors")
+        if recent_lines:
+            logger.error(f"Last Appium output: {recent_lines[-1].decode('utf-8', errors='ignore').strip()}")
         if _appium_process:
             _appium_process.terminate()
             _appium_process = None
@@ -283,8 +983,15 @@ def is_uiautomator2_crash_error(error) -> bool:
     Returns:
         bool: True if error indicates UiAutomator2 crash
     """
-    error_str = str(error).lower()
-    return any(indicator.lower() in error_str for indicator in UIAUTOMATOR2_CRASH_INDICATORS)
+    # OPTIMIZED: A dead session is classified by type - the message is only searched otherwise
+    if isinstance(error, InvalidSessionIdException):
+        return True
+    return _CRASH_RE.search(str(error)) is not None
+
+
+# Time of the last successful full health check (driver.current_activity round trip)
+_last_healthy_ts = 0.0
+_HEALTH_TTL = 5.0
 
 
 def check_connection_health(driver) -> bool:
@@ -295,14 +1002,22 @@ def check_connection_health(driver) -> bool:
     Returns:
         bool: True if connection is healthy, False otherwise
     """
+    global _last_healthy_ts
+    
     # OPTIMIZED: Quick check if Appium server is reachable first (fastest check)
     if not check_appium_server_reachable():
         logger.warning("Appium server is not reachable on port 4723")
         return False
     
+    # OPTIMIZED: The device round trip below is skipped if it succeeded within the last
+    # _HEALTH_TTL seconds - the reachability check above is enough in between
+    if time.monotonic() - _last_healthy_ts < _HEALTH_TTL:
+        return True
+    
     try:
         # Try a simple operation that requires server connection
         driver.current_activity
+        _last_healthy_ts = time.monotonic()
         return True
     except CONNECTION_ERRORS as e:
         if is_appium_server_down(e):
@@ -321,10 +1036,82 @@ def check_connection_health(driver) -> bool:
             logger.warning("Appium server appears to be down")
             return False
         # Other exceptions might not be connection-related
-        logger.debug(f"Connection check returned unexpected error: {e}")
+        logger.debug("Connection check returned unexpected error: %s", e)
         return True  # Assume connection is fine if it's not a connection error
 
 
+def _wait_until(cond, max_s: float = 4.0, start: float = 0.1) -> bool:
+    """
+    Poll cond() with exponential backoff (start, 2x, 4x, ... capped at 0.5s) until it is true.
+    
+    Args:
+        cond: Callable returning a truthy value once the wait is over
+        max_s: Maximum time to wait in seconds
+        start: Initial delay between polls in seconds
+        
+    Returns:
+        bool: True if cond() became true, False on timeout
+    """
+    deadline = time.monotonic() + max_s
+    delay = start
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+    return False
+
+
+def _session_alive(driver) -> bool:
+    """
+    Session-level probe: the session exists and answers a real command.
+    
+    Unlike check_connection_health this is never served from the _HEALTH_TTL cache, and
+    unlike the Appium port check it fails while UiAutomator2 is still restarting.
+    
+    Args:
+        driver: Appium driver
+        
+    Returns:
+        bool: True if the session answered
+    """
+    try:
+        return bool(driver.session_id) and driver.current_activity is not None
+    except Exception:
+        return False
+
+
+def backoff_sleep(attempt: int, base: float = 0.2, cap: float = 4.0):
+    """
+    Sleep for an exponential backoff delay with full jitter.
+    
+    The delay is drawn uniformly from [0, min(cap, base * 2**attempt)], so a quick
+    server restart is picked up almost immediately and concurrent workers retrying
+    against the same Appium server do not reconnect in lockstep.
+    
+    Args:
+        attempt: Zero-based retry attempt number
+        base: Delay ceiling for the first attempt in seconds
+        cap: Maximum delay ceiling in seconds
+    """
+    # Interruptible: returns early when shutdown is requested
+    shutdown_event.wait(random.uniform(0, min(cap, base * (2 ** attempt))))
+
+
+def apply_driver_settings(driver):
+    """
+    Apply DRIVER_SETTINGS to a new UiAutomator2 session (settings are per session).
+    
+    Args:
+        driver: Appium driver
+    """
+    try:
+        driver.update_settings(DRIVER_SETTINGS)
+        logger.debug("Applied driver settings: %s", DRIVER_SETTINGS)
+    except WebDriverException as e:
+        logger.warning(f"Could not apply driver settings: {e}")
+
+
 def reconnect_driver() -> bool:
     """
     Attempt to reconnect to Appium by closing old driver and creating a new one.
@@ -334,10 +1121,15 @@ def reconnect_driver() -> bool:
     Returns:
         bool: True if reconnection succeeded, False otherwise
     """
+    global _last_healthy_ts
+    
     logger.warning("=" * 60)
     logger.warning("Attempting to reconnect to Appium server...")
     logger.warning("=" * 60)
     
+    # The new session must pass a full health check - don't reuse the old session's result
+    _last_healthy_ts = 0.0
+    
     try:
         # Close old driver
         try:
@@ -345,9 +1137,10 @@ def reconnect_driver() -> bool:
         except:
             pass  # Ignore errors when closing dead connection
         
-        # Wait longer if UiAutomator2 crashed (needs time to recover)
-        logger.info("Waiting for UiAutomator2 server to recover...")
-        time.sleep(5)  # Increased wait time for UiAutomator2 recovery
+        # Wait for the Appium server itself if it went down (returns at once when only
+        # UiAutomator2 crashed - its recovery is polled on the new session below)
+        logger.info("Waiting for Appium server...")
+        _wait_until(check_appium_server_reachable, max_s=8.0)
         
         # Try to create new driver (this will restart UiAutomator2 session)
         logger.info("Creating new driver connection...")
@@ -357,6 +1150,7 @@ def reconnect_driver() -> bool:
             logger.error(f"[ERROR] Failed to create new driver: {e}")
             logger.error("UiAutomator2 server may need manual restart")
             return False
+        apply_driver_settings(driver)
         
         # OPTIMIZED: Check if Appium server is reachable first (fastest check)
         if not check_appium_server_reachable():
@@ -364,24 +1158,21 @@ def reconnect_driver() -> bool:
             logger.error("Please ensure Appium server is running: appium")
             return False
         
-        # Verify connection works (with retries for UiAutomator2 startup)
-        max_health_checks = 2  # Reduced from 3 to 2 for faster failure
-        for check_attempt in range(max_health_checks):
-            if check_connection_health(driver):
-                break
-            if check_attempt < max_health_checks - 1:
-                logger.info(f"Health check failed, waiting for UiAutomator2 to start... (attempt {check_attempt + 1}/{max_health_checks})")
-                time.sleep(2)  # Reduced from 3s to 2s
-            else:
-                logger.error("[ERROR] Reconnection failed - connection still not healthy after retries")
-                return False
+        # Wait for UiAutomator2 to recover (OPTIMIZED: polls the new session with backoff
+        # instead of a fixed 5s sleep)
+        logger.info("Waiting for UiAutomator2 server to recover...")
+        if not _wait_until(lambda: _session_alive(driver), max_s=5.0):
+            logger.error("[ERROR] Reconnection failed - new session is not answering")
+            return False
+        _last_healthy_ts = time.monotonic()
         
         # Try to reactivate the app
         logger.info("Attempting to reactivate Doubble app...")
         try:
             driver.activate_app("dk.doubble.dating")
             logger.info("[OK] App reactivated")
-            time.sleep(2)  # Reduced wait time
+            # Wait for the app to reach the foreground (app state 4 = running in foreground)
+            _wait_until(lambda: driver.query_app_state("dk.doubble.dating") == 4, max_s=3.0)
         except Exception as e:
             logger.warning(f"Could not reactivate app automatically: {e}")
             logger.info("App may still be open on the device. Continuing...")
@@ -418,7 +1209,6 @@ def retry_with_reconnect(func, *args, max_retries=2, **kwargs):
             return func(*args, **kwargs)
         except CONNECTION_ERRORS as e:
             if attempt < max_retries:
-                error_msg = str(e)
                 if is_uiautomator2_crash_error(e):
                     logger.warning(f"UiAutomator2 crash detected (attempt {attempt + 1}/{max_retries + 1})")
                 else:
@@ -428,7 +1218,6 @@ def retry_with_reconnect(func, *args, max_retries=2, **kwargs):
                 if reconnect_driver():
                     logger.info("Retrying operation after reconnection...")
                     # Update driver reference in page objects
-                    from drivers import get_driver
                     driver = get_driver()
                     # Note: Page objects will get new driver on next call
                     time.sleep(2)  # Wait a bit longer after reconnection
@@ -449,11 +1238,42 @@ def retry_with_reconnect(func, *args, max_retries=2, **kwargs):
     return None
 
 
-def ensure_on_swipe_screen(page: BasePage, screen_detector: DoubbleScreenDetector, swipe_page: DoubbleSwipePage) -> bool:
+def _on_swipe_screen(swipe_page: DoubbleSwipePage, timeout: float = 0.2, root=None) -> bool:
+    """
+    Ultra-fast swipe screen check: is the like button present?
+    
+    Args:
+        swipe_page: DoubbleSwipePage instance
+        timeout: Timeout in seconds for the like button probe
+        root: Optional lxml root of the current page source (checked in memory, no probe)
+        
+    Returns:
+        bool: True if the like button is present
+    """
+    if root is not None and _LIKE_QUERY is not None:
+        return bool(_LIKE_QUERY(root))
+    try:
+        return swipe_page.is_element_present_silent("android_uiautomator", LIKE_SELECTOR, timeout=timeout)
+    except WebDriverException:
+        return False
+
+
+def ensure_on_swipe_screen(page: BasePage, screen_detector: DoubbleScreenDetector, swipe_page: DoubbleSwipePage,
+                           tree: Optional[TreeCache] = None) -> bool:
     """
     Ensure we're on the swipe screen. Navigate there if needed.
     Uses multiple strategies to get to swipe screen.
     
+    OPTIMIZED: The like button is probed once on entry and once after each navigation
+    step, instead of re-checking an unchanged screen before every step.
+    
+    Args:
+        page: BasePage instance
+        screen_detector: DoubbleScreenDetector instance
+        swipe_page: DoubbleSwipePage instance
+        tree: Optional TreeCache shared with the caller - the entry checks reuse its
+              page source while it is fresh
+    
     Returns:
         bool: True if successfully on swipe screen, False otherwise
     """
@@ -461,123 +1281,65 @@ def ensure_on_swipe_screen(page: BasePage, screen_detector: DoubbleScreenDetecto
     logger.info("Navigating to swipe screen...")
     logger.info("=" * 60)
     
+    if tree is None:
+        tree = TreeCache(page.driver)
+    
     # Handle any pop-ups first (quiet mode)
-    dismissed = swipe_page.handle_popups_quiet()
+    dismissed = swipe_page.handle_popups_quiet(root=tree.root())
     if dismissed > 0:
+        tree.invalidate()
         logger.info(f"[!] Dismissed {dismissed} pop-up(s)")
     
     # OPTIMIZED: Ultra-fast check first - skip if already on swipe
-    try:
-        if swipe_page.is_element_present_silent("xpath", "//*[contains(@content-desc, 'Like') or contains(@content-desc, 'like')]", timeout=0.1):
-            logger.info("[FAST] Like button found - already on swipe screen!")
-            return True
-    except:
-        pass
-    
-    # OPTIMIZED: Removed initial wait - not needed
+    if _on_swipe_screen(swipe_page, timeout=0.1, root=tree.root()):
+        logger.info("[FAST] Like button found - already on swipe screen!")
+        return True
     
     # Try up to 2 attempts (reduced from 3 for speed)
+    # Screen detection already done in main() - we know we're on HOME and need to navigate
     for attempt in range(1, 3):
-        logger.info(f"Navigation attempt {attempt}/2...")
+        logger.info(f"Navigation attempt {attempt}/2 - navigating to swipe screen...")
         
-        # OPTIMIZED: Ultra-fast like button check first (faster than full screen detection)
+        # Strategy 1: FAST - Try direct swipe button locators (no slow analysis)
+        # OPTIMIZED: All locators are combined into one XPath - a single find_elements
+        # round trip instead of one presence check per locator
         try:
-            if swipe_page.is_element_present_silent("xpath", "//*[contains(@content-desc, 'Like') or contains(@content-desc, 'like')]", timeout=0.1):
-                logger.info("[OK] Like button found - we're on swipe screen!")
-                return True
-        except:
-            pass
-        
-        # OPTIMIZED: Skip slow screen detection - just try navigation directly
-        # Screen detection already done in main() - we know we need to navigate
-        current_screen = "home"  # Assume home if we got here
+            swipe_button = page.find_first_matching(SWIPE_BUTTON_LOCATORS, timeout=0.2)
+            if swipe_button is not None:
+                logger.info("✓ Found swipe button! Clicking...")
+                swipe_button.click()
+                time.sleep(1.5)  # Reduced wait time
+            else:
+                logger.debug("Could not find swipe button with direct locators - trying alternatives")
+        except WebDriverException as e:
+            # Skip UiAutomator2 crashes - will be handled by reconnection
+            error_str = str(e).lower()
+            if "instrumentation process is not running" in error_str or "crashed" in error_str:
+                raise  # Re-raise to trigger reconnection
         
-        # If on login screen, we can't proceed
-        if current_screen == "login":
-            logger.error("On LOGIN screen - user needs to log in manually first!")
-            logger.error("Please log in to the app, then run this script again.")
-            return False
+        # Strategy 2: Try swiping gestures (sometimes we're already on swipe but not detected)
+        if attempt >= 2:
+            logger.info("Trying swipe gesture as last resort...")
+            try:
+                # Try swiping right (like gesture) - if we're on swipe, this will work
+                page.swipe_right()
+                time.sleep(0.8)  # Reduced wait time
+            except WebDriverException as e:
+                logger.debug("Swipe gesture failed: %s", e)
         
-        # If already on swipe screen, we're done
-        if current_screen == "swipe":
-            logger.info("[OK] Verified - we're on swipe screen!")
+        if _on_swipe_screen(swipe_page, timeout=0.5):
+            logger.info("[OK] Successfully navigated to swipe screen!")
             return True
         
-        # Always try to navigate to swipe screen if not verified
-        if current_screen in ["home", "unknown"]:
-            logger.info(f"On {current_screen.upper()} screen - navigating to swipe screen...")
-            
-            # Strategy 1: FAST - Try direct swipe button locators (no slow analysis)
-            swipe_button_locators = [
-                ("xpath", "//*[contains(@content-desc, 'Swipe') or contains(@text, 'Swipe')]"),
-                ("xpath", "//*[contains(@content-desc, 'swipe') or contains(@text, 'swipe')]"),
-                ("accessibility_id", "Swipe"),
-                ("accessibility_id", "swipe"),
-                ("id", "dk.doubble.dating:id/swipe"),
-                ("id", "dk.doubble.dating:id/swipe_button"),
-                ("id", "dk.doubble.dating:id/btn_swipe"),
-            ]
-            
-            found_swipe_button = False
-            for locator_type, locator_value in swipe_button_locators:
-                try:
-                    if page.is_element_present_silent(locator_type, locator_value, timeout=0.2):
-                        logger.info(f"✓ Found swipe button! Clicking: {locator_type}={locator_value[:50]}...")
-                        page.tap(locator_type, locator_value)
-                        found_swipe_button = True
-                        time.sleep(1.5)  # Reduced wait time
-                        
-                        # OPTIMIZED: Ultra-fast like button check (faster than screen detection)
-                        try:
-                            if swipe_page.is_element_present_silent("xpath", "//*[contains(@content-desc, 'Like') or contains(@content-desc, 'like')]", timeout=0.3):
-                                logger.info("[OK] Successfully navigated to swipe screen!")
-                                return True
-                        except:
-                            pass
-                        break
-                except Exception as e:
-                    # Skip UiAutomator2 crashes - will be handled by reconnection
-                    error_str = str(e).lower()
-                    if "instrumentation process is not running" in error_str or "crashed" in error_str:
-                        raise  # Re-raise to trigger reconnection
-                    continue
-            
-            if not found_swipe_button:
-                logger.debug("Could not find swipe button with direct locators - trying alternatives")
-            
-            # Strategy 2: Try tapping on swipe-related UI elements (already done above, skip)
-            # This is now redundant - removed for speed
-            
-            # Strategy 3: Try swiping gestures (sometimes we're already on swipe but not detected)
-            if attempt >= 2:
-                logger.info("Trying swipe gesture as last resort...")
-                try:
-                    # Try swiping right (like gesture) - if we're on swipe, this will work
-                    page.swipe_right()
-                    time.sleep(0.8)  # Reduced wait time
-                    
-                    # Quick check - faster than full screen detection
-                    try:
-                        if swipe_page.is_element_present_silent("xpath", "//*[contains(@content-desc, 'Like') or contains(@content-desc, 'like')]", timeout=0.3):
-                            logger.info("[OK] Found swipe screen via swipe gesture!")
-                            return True
-                    except:
-                        pass
-                except Exception as e:
-                    logger.debug(f"Swipe gesture failed: {e}")
-        
         # OPTIMIZED: Reduced wait time before next attempt
         if attempt < 2:
             time.sleep(0.3)  # Reduced from 0.5s to 0.3s
     
     # OPTIMIZED: Ultra-fast final check - just check like button (faster than screen detection)
     logger.info("Final check for swipe screen...")
-    try:
-        if swipe_page.is_element_present_silent("xpath", "//*[contains(@content-desc, 'Like') or contains(@content-desc, 'like')]", timeout=0.3):
-            logger.info("[OK] Found swipe screen on final check!")
-            return True
-    except:
-        pass
+    if _on_swipe_screen(swipe_page, timeout=1.0):
+        logger.info("[OK] Found swipe screen on final check!")
+        return True
     
     logger.warning("=" * 60)
     logger.warning("Could not navigate to swipe screen automatically.")
@@ -603,7 +1365,14 @@ def swipe_and_like_loop(swipe_page: DoubbleSwipePage, page: BasePage, max_iterat
     iteration = 0
     likes_count = 0
     consecutive_connection_errors = 0
-    max_consecutive_errors = 5
+    max_consecutive_errors = MAX_CONSECUTIVE_ERRORS
+    
+    # Hot loop: bind frequently used globals/attributes to locals (LOAD_FAST instead of lookups)
+    _swipe_right = page.swipe_right_fast
+    _get_driver = get_driver
+    _sleep = time.sleep
+    _wait = shutdown_event.wait  # Interruptible sleep for the error/recovery paths
+    _check_health = check_connection_health
     
     # ULTRA-FAST: Minimal logging for speed
     logger.info("Starting continuous like automation...")
@@ -619,25 +1388,36 @@ def swipe_and_like_loop(swipe_page: DoubbleSwipePage, page: BasePage, max_iterat
     #         logger.error("Cannot continue - connection failed")
     #         return
     
-    while running:
+    while not shutdown_event.is_set():
         iteration += 1
         
         if max_iterations and iteration > max_iterations:
             logger.info(f"Reached maximum iterations ({max_iterations}). Stopping.")
             break
         
-        # Periodic connection health check (every 10 iterations)
-        if iteration % 10 == 0:
-            if not check_connection_health(page.driver):
+        # Periodic maintenance (OPTIMIZED: a single cheap bitmask branch per iteration):
+        # pop-up check and connection health check every 16 iterations
+        if (iteration & 0x0F) == 0:
+            # OPTIMIZED: Inline between swipes (commands on one session are serialized anyway, and a
+            # tap must not land mid-gesture) - one page_source fetch, the device is only probed
+            # when a close button is actually on screen
+            try:
+                dismissed = swipe_page.handle_popups_quiet(root=page_source_snapshot(page.driver))
+                if dismissed > 0:
+                    logger.info(f"[!] Dismissed {dismissed} pop-up(s)")
+            except Exception:
+                pass  # Silently continue - the swipe below surfaces real connection errors
+            
+            if not _check_health(page.driver):
                 logger.warning("Periodic health check failed - attempting reconnection...")
                 if reconnect_driver():
                     # Update page objects with new driver
-                    from drivers import get_driver
-                    new_driver = get_driver()
+                    new_driver = _get_driver()
                     page.driver = new_driver
                     swipe_page.driver = new_driver
                     # Clear cache when reconnecting (old session elements won't work)
                     swipe_page.clear_like_button_cache()
+                    _window_size_cache.clear()
                     consecutive_connection_errors = 0
                     logger.info("Page objects updated with new driver connection")
                 else:
@@ -649,16 +1429,6 @@ def swipe_and_like_loop(swipe_page: DoubbleSwipePage, page: BasePage, max_iterat
         logger.info(f"--- Like #{iteration} ---")
         
         try:
-            # OPTIMIZED: Check pop-ups less frequently (every 20 iterations) to avoid pauses
-            # This prevents the pause on iteration 5
-            if iteration % 20 == 0:
-                try:
-                    dismissed = swipe_page.handle_popups_quiet()
-                    if dismissed > 0:
-                        logger.info(f"[!] Dismissed {dismissed} pop-up(s)")
-                except Exception as popup_error:
-                    # Silently continue - don't log errors for speed
-                    pass
             # Removed page source save for speed
             
             # ULTRA-FAST: Skip pre-emptive server check - just try to swipe and handle errors if they occur
@@ -667,14 +1437,13 @@ def swipe_and_like_loop(swipe_page: DoubbleSwipePage, page: BasePage, max_iterat
             # ULTRA-FAST: Skip like button search entirely - just use swipe gesture directly
             # Swipe gesture is faster and more reliable than searching for like button
             try:
-                page.swipe_right()
+                _swipe_right()
                 likes_count += 1
                 logger.info(f"✓ Swiped right (liked) #{likes_count} (attempt #{iteration})")
                 consecutive_connection_errors = 0  # Reset on success
                 
-                time.sleep(0.05)  # ULTRA-FAST: Minimal wait after swipe (reduced from 0.15s)
+                _sleep(0.05)  # ULTRA-FAST: Minimal wait after swipe (reduced from 0.15s)
             except CONNECTION_ERRORS as e:
-                error_str = str(e).lower()
                 # OPTIMIZED: Fail fast if Appium server is clearly down
                 if is_appium_server_down(e):
                     logger.warning("Appium server is down - attempting reconnection...")
@@ -688,17 +1457,17 @@ def swipe_and_like_loop(swipe_page: DoubbleSwipePage, page: BasePage, max_iterat
                 
                 # Try to reconnect
                 if reconnect_driver():
-                    from drivers import get_driver
-                    new_driver = get_driver()
+                    new_driver = _get_driver()
                     page.driver = new_driver
                     swipe_page.driver = new_driver
                     # Clear cache when reconnecting
                     swipe_page.clear_like_button_cache()
+                    _window_size_cache.clear()
                     consecutive_connection_errors = 0
-                    time.sleep(0.5)  # Reduced wait time
+                    _wait(0.5)  # Reduced wait time
                     continue
                 else:
-                    time.sleep(1)  # Reduced wait time
+                    backoff_sleep(consecutive_connection_errors)
                     continue
             except Exception as e:
                 error_str = str(e).lower()
@@ -711,11 +1480,10 @@ def swipe_and_like_loop(swipe_page: DoubbleSwipePage, page: BasePage, max_iterat
                 if consecutive_connection_errors >= max_consecutive_errors:
                     logger.error("Too many consecutive errors. Stopping.")
                     break
-                time.sleep(0.2)  # Minimal wait on error
+                _wait(0.2)  # Minimal wait on error
                 continue  # Continue to next iteration
         
         except CONNECTION_ERRORS as e:
-            error_str = str(e).lower()
             # OPTIMIZED: Fail fast if Appium server is clearly down
             if is_appium_server_down(e):
                 logger.warning("Appium server is down - attempting reconnection...")
@@ -729,28 +1497,130 @@ def swipe_and_like_loop(swipe_page: DoubbleSwipePage, page: BasePage, max_iterat
             
             # Try to reconnect
             if reconnect_driver():
-                from drivers import get_driver
-                new_driver = get_driver()
+                new_driver = _get_driver()
                 page.driver = new_driver
                 swipe_page.driver = new_driver
                 # Clear cache when reconnecting
                 swipe_page.clear_like_button_cache()
-                time.sleep(1)  # Reduced wait time
+                _window_size_cache.clear()
+                _wait(1)  # Reduced wait time
                 continue
             else:
                 logger.warning("Reconnection failed. Waiting before retry...")
-                time.sleep(2)  # Reduced wait time
+                backoff_sleep(consecutive_connection_errors)
+                continue
+        
+        # ULTRA-FAST: No delay between iterations for maximum speed
+        # Removed sleep entirely for fastest possible swiping
+    
+    if shutdown_event.is_set():
+        logger.info("Stop requested - leaving swipe loop")
+    
+    logger.info("")
+    logger.info("=" * 60)
+    logger.info("Swipe automation completed")
+    logger.info(f"Total likes: {likes_count}")
+    logger.info(f"Total iterations: {iteration}")
+    logger.info("=" * 60)
+
+
+# Screen size never changes during a session - fetched once (cleared on reconnect)
+_window_size_cache = {}
+
+
+def get_cached_window_size(driver) -> dict:
+    """
+    Get the device window size, asking Appium only the first time.
+    
+    Args:
+        driver: Appium driver
+        
+    Returns:
+        dict: Window size with 'width' and 'height'
+    """
+    if 'size' not in _window_size_cache:
+        _window_size_cache['size'] = driver.get_window_size()
+    return _window_size_cache['size']
+
+
+def _find_by_uiautomator(page: BasePage, selector: str, timeout: float = 2):
+    """
+    Find the first element matching a UiAutomator2 selector (no error logging).
+    
+    One native UiAutomator2 query per poll, however many ';'-separated alternatives
+    the selector lists - instead of one Appium round trip per candidate locator.
+    
+    Args:
+        page: BasePage instance
+        selector: UiSelector expression (alternatives separated by ';')
+        timeout: Timeout in seconds
+        
+    Returns:
+        WebElement: First matching element, or None if nothing matched in time
+    """
+    try:
+        return WebDriverWait(page.driver, timeout).until(
+            EC.presence_of_element_located((AppiumBy.ANDROID_UIAUTOMATOR, selector))
+        )
+    except TimeoutException:
+        return None
+
+
+def _wait_for_ui(page: BasePage, condition, timeout: float = 2) -> bool:
+    """
+    Wait for an expected condition instead of sleeping a fixed "settle" time.
+    
+    Returns as soon as the condition holds; a timeout is not an error - the next
+    step's own lookup decides whether the flow can continue.
+    
+    Args:
+        page: BasePage instance
+        condition: Expected condition (e.g. EC.presence_of_element_located(...))
+        timeout: Maximum time to wait in seconds
+        
+    Returns:
+        bool: True if the condition was met, False on timeout
+    """
+    try:
+        WebDriverWait(page.driver, timeout).until(condition)
+        return True
+    except TimeoutException:
+        return False
+
+
+def _sweep_locators(page: BasePage, locators, timeout: float = 2):
+    """
+    Return the first element found by the first matching locator in a fallback list.
+    
+    Each pass issues one non-blocking find_element per locator (implicit wait must be 0,
+    see navigate_to_matches_and_send_message) and the whole list is re-swept until the
+    timeout - worst case is one timeout in total instead of one timeout per locator.
+    find_element lets the server stop at the first hit and return a single element,
+    instead of serializing every matching list row as find_elements does.
+    
+    Args:
+        page: BasePage instance
+        locators: Iterable of (locator_type, locator_value, log_value) triples
+        timeout: Maximum time to keep sweeping in seconds
+        
+    Returns:
+        WebElement: First match of the first matching locator, or None if nothing matched
+    """
+    # Locator types are mapped to Appium "by" strategies once, not on every pass
+    locators = [(_resolve_by(locator_type), locator_type, locator_value, log_value)
+                for locator_type, locator_value, log_value in locators]
+    deadline = time.monotonic() + timeout
+    while True:
+        for by, locator_type, locator_value, log_value in locators:
+            try:
+                element = page.driver.find_element(by, locator_value)
+            except WebDriverException:  # Includes NoSuchElementException
                 continue
-        
-        # ULTRA-FAST: No delay between iterations for maximum speed
-        # Removed sleep entirely for fastest possible swiping
-    
-    logger.info("")
-    logger.info("=" * 60)
-    logger.info("Swipe automation completed")
-    logger.info(f"Total likes: {likes_count}")
-    logger.info(f"Total iterations: {iteration}")
-    logger.info("=" * 60)
+            logger.debug("Matched %s=%s...", locator_type, log_value)
+            return element
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.1)
 
 
 def send_message_in_chat(page: BasePage, message_text: str = "Hey! How are you?") -> bool:
@@ -765,51 +1635,33 @@ def send_message_in_chat(page: BasePage, message_text: str = "Hey! How are you?"
         bool: True if message was sent successfully, False otherwise
     """
     try:
-        logger.info(f"Sending message: '{message_text}'...")
-        
-        # Find message input field
-        message_input_locators = [
-            ("xpath", "//*[@class='android.widget.EditText']"),
-            ("xpath", "//*[contains(@hint, 'Message') or contains(@hint, 'message')]"),
-            ("xpath", "//*[contains(@content-desc, 'Message') or contains(@content-desc, 'message')]"),
-            ("id", "dk.doubble.dating:id/message_input"),
-            ("id", "dk.doubble.dating:id/edit_message"),
-            ("id", "dk.doubble.dating:id/et_message"),
-        ]
+        logger.info("Sending message: '%s'...", message_text)
         
+        # Find message input field (single native query)
         message_sent = False
-        
-        for locator_type, locator_value in message_input_locators:
-            try:
-                if page.is_element_present_silent(locator_type, locator_value, timeout=2):
-                    logger.info(f"Found message input: {locator_type}={locator_value[:50]}...")
-                    page.enter_text(locator_type, locator_value, message_text, clear_first=True)
-                    time.sleep(0.5)
-                    
-                    # Find and click send button
-                    send_locators = [
-                        ("xpath", "//*[contains(@content-desc, 'Send') or contains(@content-desc, 'send')]"),
-                        ("xpath", "//*[contains(@text, 'Send')]"),
-                        ("id", "dk.doubble.dating:id/send"),
-                        ("id", "dk.doubble.dating:id/btn_send"),
-                    ]
-                    
-                    for send_loc_type, send_loc_value in send_locators:
-                        try:
-                            if page.is_element_present_silent(send_loc_type, send_loc_value, timeout=1):
-                                logger.info(f"Found send button: {send_loc_type}={send_loc_value[:50]}...")
-                                page.tap(send_loc_type, send_loc_value)
-                                message_sent = True
-                                logger.info(f"✓ Message sent: '{message_text}'")
-                                time.sleep(1)
-                                break
-                        except:
-                            continue
-                    
-                    if message_sent:
-                        break
-            except Exception as e:
-                continue
+        # Waits for the chat screen to open - callers do not sleep after tapping into a chat
+        message_input = _find_by_uiautomator(page, MESSAGE_INPUT_SELECTOR, timeout=3)
+        if message_input is not None:
+            logger.info("Found message input")
+            message_input.clear()
+            message_input.send_keys(message_text)
+            logger.info("Entered text '%s' into message input", message_text)
+            
+            # Find and click send button (appears/enables once the input has text)
+            send_button = _find_by_uiautomator(page, SEND_BUTTON_SELECTOR, timeout=1.5)
+            if send_button is not None:
+                logger.info("Found send button")
+                send_button.click()
+                message_sent = True
+                logger.info("✓ Message sent: '%s'", message_text)
+                
+                # The input is cleared (or replaced) once the message has gone out
+                def _input_cleared(_):
+                    try:
+                        return message_input.text != message_text
+                    except WebDriverException:
+                        return True
+                _wait_for_ui(page, _input_cleared, timeout=1)
         
         if not message_sent:
             logger.warning("Could not find message input or send button. Trying alternative: pressing Enter...")
@@ -820,13 +1672,13 @@ def send_message_in_chat(page: BasePage, message_text: str = "Hey! How are you?"
                 time.sleep(1)
                 message_sent = True
             except Exception as e:
-                logger.error(f"Could not send message: {e}")
+                logger.error("Could not send message: %s", e)
                 return False
         
         return message_sent
         
     except Exception as e:
-        logger.error(f"Error sending message in chat: {e}", exc_info=True)
+        logger.error("Error sending message in chat: %s", e, exc_info=True)
         return False
 
 
@@ -846,144 +1698,74 @@ def send_message_to_new_match(page: BasePage) -> bool:
         logger.info("=" * 60)
         
         logger.info("Step 1: Navigating to likes/matches section...")
-        time.sleep(1)
         
         # Try to find and click on "Likes" or "Matches" in navigation
-        likes_match_locators = [
-            ("xpath", "//*[contains(@content-desc, 'Likes') or contains(@content-desc, 'likes')]"),
-            ("xpath", "//*[contains(@text, 'Likes') or contains(@text, 'likes')]"),
-            ("xpath", "//*[contains(@content-desc, 'Matches') or contains(@content-desc, 'matches')]"),
-            ("xpath", "//*[contains(@text, 'Matches') or contains(@text, 'matches')]"),
-            ("id", "dk.doubble.dating:id/likes"),
-            ("id", "dk.doubble.dating:id/matches"),
-            ("accessibility_id", "Likes"),
-            ("accessibility_id", "Matches"),
-        ]
-        
         clicked_likes = False
-        for locator_type, locator_value in likes_match_locators:
-            try:
-                if page.is_element_present_silent(locator_type, locator_value, timeout=1):
-                    logger.info(f"Found likes/matches button: {locator_type}={locator_value[:50]}...")
-                    page.tap(locator_type, locator_value)
-                    clicked_likes = True
-                    time.sleep(2)
-                    break
-            except Exception as e:
-                continue
+        likes_button = _find_by_uiautomator(page, LIKES_MATCHES_SELECTOR, timeout=1)
+        if likes_button is not None:
+            logger.info("Found likes/matches button")
+            likes_button.click()
+            clicked_likes = True
         
         if not clicked_likes:
             logger.warning("Could not find likes/matches button. Trying to navigate manually...")
             page.press_back()
-            time.sleep(1)
         
         logger.info("Step 2: Clicking on 'Matched' tab...")
-        time.sleep(1)
-        
-        # Find and click "Matched" tab/button
-        matched_locators = [
-            ("xpath", "//*[contains(@text, 'Matched') or contains(@text, 'matched')]"),
-            ("xpath", "//*[contains(@content-desc, 'Matched') or contains(@content-desc, 'matched')]"),
-            ("xpath", "//*[contains(@text, 'Matches')]"),
-            ("id", "dk.doubble.dating:id/matched"),
-            ("id", "dk.doubble.dating:id/tab_matched"),
-        ]
         
+        # Find and click "Matched" tab/button (the wait doubles as the screen-transition settle)
         clicked_matched = False
-        for locator_type, locator_value in matched_locators:
-            try:
-                if page.is_element_present_silent(locator_type, locator_value, timeout=1):
-                    logger.info(f"Found 'Matched' button: {locator_type}={locator_value[:50]}...")
-                    page.tap(locator_type, locator_value)
-                    clicked_matched = True
-                    time.sleep(2)
-                    break
-            except Exception as e:
-                continue
+        matched_button = _find_by_uiautomator(page, MATCHED_TAB_SELECTOR, timeout=3)
+        if matched_button is not None:
+            logger.info("Found 'Matched' button")
+            matched_button.click()
+            clicked_matched = True
+            _wait_for_ui(page, EC.presence_of_element_located(LIST_LOCATOR), timeout=2)
         
         if not clicked_matched:
             logger.warning("Could not find 'Matched' button. Assuming already on matches screen...")
         
         logger.info("Step 3: Clicking on the first/recent match...")
-        time.sleep(1)
-        
-        # Find and click on the first match
-        match_locators = [
-            ("xpath", "//*[@clickable='true' and (contains(@class, 'Card') or contains(@class, 'card') or contains(@class, 'Match'))]"),
-            ("xpath", "//*[@clickable='true' and contains(@content-desc, 'match')]"),
-            ("xpath", "//androidx.recyclerview.widget.RecyclerView//*[@clickable='true']"),
-            ("xpath", "//*[contains(@class, 'RecyclerView')]//*[@clickable='true']"),
-        ]
         
+        # Find and click on the first match (OPTIMIZED: native UiAutomator2 selectors, see MATCH_LOCATORS)
         clicked_match = False
-        for locator_type, locator_value in match_locators:
+        match_element = _sweep_locators(page, MATCH_LOCATORS, timeout=2)
+        if match_element is not None:
             try:
-                elements = page.find_elements(locator_type, locator_value, timeout=2)
-                if elements:
-                    logger.info(f"Found {len(elements)} match(es). Clicking the first one...")
-                    elements[0].click()
-                    clicked_match = True
-                    time.sleep(2)
-                    break
-            except Exception as e:
-                continue
+                logger.info("Found a match. Clicking it...")
+                match_element.click()
+                clicked_match = True
+                # Profile has opened once the tapped list row is gone
+                _wait_for_ui(page, EC.staleness_of(match_element), timeout=2)
+            except WebDriverException as e:
+                logger.debug("Could not click match: %s", e)
         
         if not clicked_match:
             logger.warning("Could not find a match to click. Trying alternative approach...")
-            size = page.driver.get_window_size()
+            size = get_cached_window_size(page.driver)
             center_x = size["width"] // 2
             center_y = size["height"] // 2
-            page.driver.tap([(center_x, center_y)], 100)
+            # Native UiAutomator2 gesture - no legacy TouchAction-to-W3C translation
+            page.driver.execute_script('mobile: clickGesture', {'x': center_x, 'y': center_y})
             time.sleep(2)
         
         logger.info("Step 4: Scrolling down on match profile...")
-        time.sleep(1)
     
-        page.swipe_up()
-        time.sleep(1)
-        page.swipe_up()
-        time.sleep(1)
+        page.swipe_up_repeated(2)  # Both scrolls in one W3C action (no settle sleeps)
         
         logger.info("Step 5: Finding and clicking 'Private Chat' or message button...")
-        time.sleep(1)
         
         # Find and click private chat/message button
-        chat_locators = [
-            ("xpath", "//*[contains(@text, 'Message') or contains(@text, 'message')]"),
-            ("xpath", "//*[contains(@text, 'Chat') or contains(@text, 'chat')]"),
-            ("xpath", "//*[contains(@text, 'Send Message')]"),
-            ("xpath", "//*[contains(@content-desc, 'Message') or contains(@content-desc, 'message')]"),
-            ("xpath", "//*[contains(@content-desc, 'Chat') or contains(@content-desc, 'chat')]"),
-            ("id", "dk.doubble.dating:id/message"),
-            ("id", "dk.doubble.dating:id/chat"),
-            ("id", "dk.doubble.dating:id/btn_message"),
-        ]
-        
         clicked_chat = False
-        for locator_type, locator_value in chat_locators:
-            try:
-                if page.is_element_present_silent(locator_type, locator_value, timeout=2):
-                    logger.info(f"Found chat/message button: {locator_type}={locator_value[:50]}...")
-                    page.tap(locator_type, locator_value)
-                    clicked_chat = True
-                    time.sleep(2)
-                    break
-            except Exception as e:
-                continue
-        
-        if not clicked_chat:
+        chat_button = _find_by_uiautomator(page, CHAT_BUTTON_SELECTOR, timeout=2)
+        if chat_button is None:
             logger.warning("Could not find chat button. Trying to scroll more...")
             page.swipe_up()
-            time.sleep(1)
-            for locator_type, locator_value in chat_locators:
-                try:
-                    if page.is_element_present_silent(locator_type, locator_value, timeout=1):
-                        page.tap(locator_type, locator_value)
-                        clicked_chat = True
-                        time.sleep(2)
-                        break
-                except:
-                    continue
+            chat_button = _find_by_uiautomator(page, CHAT_BUTTON_SELECTOR, timeout=2)
+        if chat_button is not None:
+            logger.info("Found chat/message button")
+            chat_button.click()
+            clicked_chat = True
         
         if not clicked_chat:
             logger.error("Could not find chat button. Cannot send message to new match.")
@@ -993,8 +1775,60 @@ def send_message_to_new_match(page: BasePage) -> bool:
         return send_message_in_chat(page, "Hey! How are you?")
         
     except Exception as e:
-        logger.error(f"Error sending message to new match: {e}", exc_info=True)
+        logger.error("Error sending message to new match: %s", e, exc_info=True)
+        return False
+
+
+def press_back_twice(page: BasePage):
+    """
+    Press BACK twice (out of the chat, then out of the profile).
+    
+    OPTIMIZED: Both key events go out in one `mobile: shell` call - `input keyevent` only
+    returns once they are dispatched, so no settle sleep is needed in between. Needs the
+    Appium server started with --relaxed-security (adb_shell); otherwise falls back to two
+    press_back() calls.
+    
+    Args:
+        page: BasePage instance
+    """
+    try:
+        page.driver.execute_script('mobile: shell', {
+            'command': 'input',
+            'args': ['keyevent', 'KEYCODE_BACK', 'KEYCODE_BACK'],
+            'timeout': 3000,
+        })
+        return
+    except WebDriverException as e:
+        logger.debug("mobile: shell unavailable (%s) - pressing back individually", e)
+    page.press_back()
+    time.sleep(1)
+    page.press_back()  # May need to go back twice
+    time.sleep(1)
+
+
+def jump_to_messages(page: BasePage) -> bool:
+    """
+    Open the Messages screen directly with one `mobile: startActivity` call.
+    
+    Replaces backing out of the current chat and tapping through Likes -> Messages
+    (several screen transitions and their animations). `mobile: startActivity` does not
+    raise when `am start` reports a missing activity, so the jump only counts once the
+    conversation list is actually on screen.
+    
+    Args:
+        page: BasePage instance
+        
+    Returns:
+        bool: True if the Messages screen is showing, False if the jump did not land there
+    """
+    if not USE_MESSAGES_JUMP:
         return False
+    try:
+        page.driver.execute_script('mobile: startActivity', {'component': MESSAGES_ACTIVITY})
+    except WebDriverException as e:
+        logger.debug("Direct jump to %s failed: %s", MESSAGES_ACTIVITY, e)
+        return False
+    return _wait_for_ui(page, EC.presence_of_element_located(LIST_LOCATOR), timeout=3)
 
 
 def send_message_to_existing_conversation(page: BasePage) -> bool:
@@ -1013,91 +1847,51 @@ def send_message_to_existing_conversation(page: BasePage) -> bool:
         logger.info("PHASE 2B: Sending message to EXISTING CONVERSATION")
         logger.info("=" * 60)
         
-        # Press back to get out of the chat from previous step
-        logger.info("Going back to navigate to existing conversations...")
-        page.press_back()
-        time.sleep(1)
-        page.press_back()  # May need to go back twice
-        time.sleep(1)
-        
-        logger.info("Step 1: Navigating to likes/matches section...")
-        time.sleep(1)
-        
-        # Navigate to likes/matches section
-        likes_match_locators = [
-            ("xpath", "//*[contains(@content-desc, 'Likes') or contains(@content-desc, 'likes')]"),
-            ("xpath", "//*[contains(@text, 'Likes') or contains(@text, 'likes')]"),
-            ("xpath", "//*[contains(@content-desc, 'Matches') or contains(@content-desc, 'matches')]"),
-            ("xpath", "//*[contains(@text, 'Matches') or contains(@text, 'matches')]"),
-            ("id", "dk.doubble.dating:id/likes"),
-            ("id", "dk.doubble.dating:id/matches"),
-            ("accessibility_id", "Likes"),
-            ("accessibility_id", "Matches"),
-        ]
-        
-        for locator_type, locator_value in likes_match_locators:
-            try:
-                if page.is_element_present_silent(locator_type, locator_value, timeout=1):
-                    logger.info(f"Found likes/matches button: {locator_type}={locator_value[:50]}...")
-                    page.tap(locator_type, locator_value)
-                    time.sleep(2)
-                    break
-            except Exception:
-                continue
-        
-        logger.info("Step 2: Looking for 'Messages' or 'Chats' tab...")
-        time.sleep(1)
-        
-        # Find and click "Messages" or "Chats" tab
-        messages_locators = [
-            ("xpath", "//*[contains(@text, 'Messages') or contains(@text, 'messages')]"),
-            ("xpath", "//*[contains(@text, 'Chat') or contains(@text, 'chat')]"),
-            ("xpath", "//*[contains(@content-desc, 'Messages') or contains(@content-desc, 'messages')]"),
-            ("xpath", "//*[contains(@content-desc, 'Chat') or contains(@content-desc, 'chat')]"),
-            ("id", "dk.doubble.dating:id/messages"),
-            ("id", "dk.doubble.dating:id/chats"),
-            ("id", "dk.doubble.dating:id/tab_messages"),
-        ]
-        
-        clicked_messages = False
-        for locator_type, locator_value in messages_locators:
-            try:
-                if page.is_element_present_silent(locator_type, locator_value, timeout=2):
-                    logger.info(f"Found messages/chats button: {locator_type}={locator_value[:50]}...")
-                    page.tap(locator_type, locator_value)
-                    clicked_messages = True
-                    time.sleep(2)
-                    break
-            except Exception as e:
-                continue
-        
-        if not clicked_messages:
-            logger.warning("Could not find Messages/Chats tab. Trying alternative navigation...")
-            page.press_back()
-            time.sleep(1)
+        # OPTIMIZED: Jump straight to the Messages screen (when enabled) instead of backing out
+        # of the chat and tapping through Likes -> Messages
+        if jump_to_messages(page):
+            logger.info("Jumped directly to Messages screen")
+        else:
+            # Press back to get out of the chat from previous step
+            logger.info("Going back to navigate to existing conversations...")
+            press_back_twice(page)
+        
+            logger.info("Step 1: Navigating to likes/matches section...")
+        
+            # Navigate to likes/matches section
+            likes_button = _find_by_uiautomator(page, LIKES_MATCHES_SELECTOR, timeout=1)
+            if likes_button is not None:
+                logger.info("Found likes/matches button")
+                likes_button.click()
+        
+            logger.info("Step 2: Looking for 'Messages' or 'Chats' tab...")
+        
+            # Find and click "Messages" or "Chats" tab (the wait doubles as the screen-transition settle)
+            clicked_messages = False
+            messages_button = _find_by_uiautomator(page, MESSAGES_TAB_SELECTOR, timeout=3)
+            if messages_button is not None:
+                logger.info("Found messages/chats button")
+                messages_button.click()
+                clicked_messages = True
+                _wait_for_ui(page, EC.presence_of_element_located(LIST_LOCATOR), timeout=2)
+        
+            if not clicked_messages:
+                logger.warning("Could not find Messages/Chats tab. Trying alternative navigation...")
+                page.press_back()
+                time.sleep(1)
         
         logger.info("Step 3: Clicking on the first existing conversation...")
-        time.sleep(1)
-        
-        # Find and click on the first conversation
-        conversation_locators = [
-            ("xpath", "//androidx.recyclerview.widget.RecyclerView//*[@clickable='true']"),
-            ("xpath", "//*[contains(@class, 'RecyclerView')]//*[@clickable='true']"),
-            ("xpath", "//*[@clickable='true' and (contains(@class, 'Conversation') or contains(@class, 'Chat'))]"),
-        ]
         
+        # Find and click on the first conversation (OPTIMIZED: native UiAutomator2 selectors)
         clicked_conversation = False
-        for locator_type, locator_value in conversation_locators:
+        conversation_element = _sweep_locators(page, CONVERSATION_LOCATORS, timeout=2)
+        if conversation_element is not None:
             try:
-                elements = page.find_elements(locator_type, locator_value, timeout=2)
-                if elements:
-                    logger.info(f"Found {len(elements)} conversation(s). Clicking the first one...")
-                    elements[0].click()
-                    clicked_conversation = True
-                    time.sleep(2)
-                    break
-            except Exception as e:
-                continue
+                logger.info("Found a conversation. Clicking it...")
+                conversation_element.click()
+                clicked_conversation = True
+            except WebDriverException as e:
+                logger.debug("Could not click conversation: %s", e)
         
         if not clicked_conversation:
             logger.error("Could not find an existing conversation to open.")
@@ -1107,7 +1901,7 @@ def send_message_to_existing_conversation(page: BasePage) -> bool:
         return send_message_in_chat(page, "Hey! How are you?")
         
     except Exception as e:
-        logger.error(f"Error sending message to existing conversation: {e}", exc_info=True)
+        logger.error("Error sending message to existing conversation: %s", e, exc_info=True)
         return False
 
 
@@ -1121,29 +1915,35 @@ def navigate_to_matches_and_send_message(page: BasePage, swipe_page: DoubbleSwip
         page: BasePage instance
         swipe_page: DoubbleSwipePage instance
     """
-    try:
-        # Send message to 1 new match
-        new_match_success = send_message_to_new_match(page)
-        
-        # Wait a bit between actions
-        time.sleep(2)
-        
-        # Send message to 1 existing conversation
-        existing_conv_success = send_message_to_existing_conversation(page)
-        
-        logger.info("")
-        logger.info("=" * 60)
-        logger.info("Match messaging automation completed!")
-        logger.info(f"  - New match: {'✓ Message sent' if new_match_success else '✗ Failed'}")
-        logger.info(f"  - Existing conversation: {'✓ Message sent' if existing_conv_success else '✗ Failed'}")
-        logger.info("=" * 60)
-        
-    except Exception as e:
-        logger.error(f"Error during match messaging: {e}", exc_info=True)
+    # OPTIMIZED: Disable the implicit wait for the messaging flows - every lookup here is an
+    # explicit wait or a non-blocking sweep, and with the implicit wait each missed
+    # find_elements would block for the full configured timeout
+    with _no_implicit(page.driver):
+        try:
+            # Send message to 1 new match
+            new_match_success = send_message_to_new_match(page)
+            
+            # Wait a bit between actions
+            time.sleep(2)
+            
+            # Send message to 1 existing conversation
+            existing_conv_success = send_message_to_existing_conversation(page)
+            
+            logger.info("")
+            logger.info("=" * 60)
+            logger.info("Match messaging automation completed!")
+            logger.info("  - New match: %s", '✓ Message sent' if new_match_success else '✗ Failed')
+            logger.info("  - Existing conversation: %s", '✓ Message sent' if existing_conv_success else '✗ Failed')
+            logger.info("=" * 60)
+            
+        except Exception as e:
+            logger.error("Error during match messaging: %s", e, exc_info=True)
 
 
 def main():
     """Main automation function."""
+    global _swipe_loop_active
+    final_screen = "unknown"  # Screen the app is left on - remembered for the next run
     try:
         logger.info("=" * 60)
         logger.info("Doubble Auto Swipe - Fully Automated")
@@ -1152,51 +1952,7 @@ def main():
         # ============================================================
         # CONFIGURATION AND ACTION PLAN (Display first, before driver init)
         # ============================================================
-        logger.info("")
-        logger.info("=" * 60)
-        logger.info("CONFIGURATION")
-        logger.info("=" * 60)
-        logger.info("Number of swipes: 5")
-        logger.info("New matches to message: 1")
-        logger.info("Existing conversations to message: 1")
-        logger.info("Message to send: 'Hey! How are you?'")
-        logger.info("Swipe speed: Ultra-fast (200ms duration)")
-        logger.info("Pop-up checks: Every 20 iterations")
-        logger.info("Connection recovery: Enabled")
-        logger.info("")
-        logger.info("=" * 60)
-        logger.info("ACTION PLAN - Doubble Automation")
-        logger.info("=" * 60)
-        logger.info("")
-        logger.info("PHASE 1: SWIPING (5 swipes)")
-        logger.info("  Step 1.1: Detect current screen")
-        logger.info("  Step 1.2: Navigate to swipe screen (if needed)")
-        logger.info("  Step 1.3: Perform 5 right swipes (like gestures)")
-        logger.info("           - Each swipe: ~0.3 seconds")
-        logger.info("           - Total time: ~1.5 seconds")
-        logger.info("")
-        logger.info("PHASE 2A: NEW MATCH MESSAGING (1 match)")
-        logger.info("  Step 2.1: Navigate to Likes/Matches section")
-        logger.info("  Step 2.2: Click on 'Matched' tab (recent matches)")
-        logger.info("  Step 2.3: Click on the first/recent match")
-        logger.info("  Step 2.4: Scroll down on match profile (2 swipes)")
-        logger.info("  Step 2.5: Find and click 'Private Chat' / 'Message' button")
-        logger.info("  Step 2.6: Find message input field")
-        logger.info("  Step 2.7: Type message: 'Hey! How are you?'")
-        logger.info("  Step 2.8: Click 'Send' button or press Enter")
-        logger.info("")
-        logger.info("PHASE 2B: EXISTING CONVERSATION MESSAGING (1 conversation)")
-        logger.info("  Step 3.1: Navigate back to Likes/Matches section")
-        logger.info("  Step 3.2: Click on 'Messages' or 'Chats' tab")
-        logger.info("  Step 3.3: Click on the first existing conversation")
-        logger.info("  Step 3.4: Find message input field")
-        logger.info("  Step 3.5: Type message: 'Hey! How are you?'")
-        logger.info("  Step 3.6: Click 'Send' button or press Enter")
-        logger.info("")
-        logger.info("=" * 60)
-        logger.info("Initializing Appium driver...")
-        logger.info("=" * 60)
-        logger.info("")
+        logger.info(_ACTION_PLAN)
         
         # Automatically start Appium server if not running
         if not check_appium_server_reachable():
@@ -1220,14 +1976,14 @@ def main():
             else:
                 # Appium was just started - wait a bit longer and verify it's ready
                 logger.info("Appium server was started. Verifying it's ready...")
-                # Wait up to 15 seconds for server to become ready
+                # Jittered exponential backoff (ceilings 0.5s, 1s, 2s, 4s, 5s) - retries early if it is already up
                 for verify_retry in range(5):
-                    time.sleep(2)
+                    backoff_sleep(verify_retry, base=0.5, cap=5)
                     if check_appium_server_reachable():
                         logger.info("[OK] Appium server is confirmed ready")
                         break
                     if verify_retry < 4:
-                        logger.info(f"Server not ready yet, waiting 2 seconds... (attempt {verify_retry + 1}/5)")
+                        logger.info(f"Server not ready yet, backing off... (attempt {verify_retry + 1}/5)")
                 else:
                     logger.error("")
                     logger.error("=" * 60)
@@ -1261,85 +2017,59 @@ def main():
         device_connected = False
         device_id = None
         try:
-            # Try direct ADB first (faster and more reliable)
-            adb_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "platform-tools" / "adb.exe"
-            if not adb_path.exists():
-                adb_path = Path("C:/LDPlayer/LDPlayer9/adb.exe")
+            # OPTIMIZED: One `adb devices -l` spawn answers both "is a device ready?" and the
+            # diagnostic listing (each extra spawn re-attaches to the ADB daemon on Windows)
+            # Resolved once here and reused by every later adb call in main()
+            adb_path = _resolve_adb_path()
+            if adb_path is not None:
+                # OPTIMIZED: Start the adb server up front so its cold start (~200-500 ms) is not
+                # charged to the first short-timeout device command below
+                try:
+                    subprocess.run(
+                        [str(adb_path), "start-server"],
+                        capture_output=True,
+                        timeout=15,
+                        creationflags=_CREATE_NO_WINDOW
+                    )
+                except Exception as e:
+                    logger.debug("adb start-server failed: %s", e)
+            # Device-side commands go through one long-lived `adb shell` (started on first use)
+            adb_shell = PersistentAdbShell(adb_path) if adb_path is not None else None
             
-            if adb_path.exists():
-                logger.debug(f"Using ADB directly: {adb_path}")
+            devices_output = ""
+            if adb_path is not None:
+                logger.debug("Using ADB directly: %s", adb_path)
                 try:
                     result = subprocess.run(
-                        [str(adb_path), "devices"],
+                        [str(adb_path), "devices", "-l"],
                         capture_output=True,
                         text=True,
                         timeout=3  # Short timeout
                     )
                     devices_output = result.stdout
-                    logger.debug(f"ADB devices output: {devices_output}")
-                    
-                    # Check if any device is connected (status should be "device")
-                    lines = devices_output.strip().split('\n')
-                    for line in lines[1:]:  # Skip header line
-                        if line.strip() and '\tdevice' in line:
-                            device_connected = True
-                            device_id = line.split('\t')[0]
-                            logger.info(f"[OK] Android device is connected: {device_id}")
-                            break
+                    if result.stderr:
+                        logger.warning("ADB stderr: %s", result.stderr)
                 except Exception as e:
-                    logger.warning(f"Direct ADB check failed: {e}, trying PowerShell...")
-                    # Fallback to PowerShell with short timeout
-                    try:
-                        ps_command = '& "$env:LOCALAPPDATA\\Android\\Sdk\\platform-tools\\adb.exe" devices'
-                        success, stdout, stderr = run_powershell_command(ps_command, timeout=3)
-                        if success and stdout:
-                            devices_output = stdout
-                            lines = devices_output.strip().split('\n')
-                            for line in lines[1:]:
-                                if line.strip() and '\tdevice' in line:
-                                    device_connected = True
-                                    device_id = line.split('\t')[0]
-                                    logger.info(f"[OK] Android device is connected: {device_id}")
-                                    break
-                    except Exception as ps_error:
-                        logger.warning(f"PowerShell check also failed: {ps_error}")
+                    logger.warning("Direct ADB check failed: %s", e)
             else:
+                # PowerShell only when adb.exe is not at a known path - never as a second attempt
                 logger.debug("ADB not found in standard locations, trying PowerShell...")
-                # Try PowerShell as last resort
                 try:
-                    ps_command = '& "$env:LOCALAPPDATA\\Android\\Sdk\\platform-tools\\adb.exe" devices'
+                    ps_command = '& "$env:LOCALAPPDATA\\Android\\Sdk\\platform-tools\\adb.exe" devices -l'
                     success, stdout, stderr = run_powershell_command(ps_command, timeout=3)
                     if success and stdout:
                         devices_output = stdout
-                        lines = devices_output.strip().split('\n')
-                        for line in lines[1:]:
-                            if line.strip() and '\tdevice' in line:
-                                device_connected = True
-                                device_id = line.split('\t')[0]
-                                logger.info(f"[OK] Android device is connected: {device_id}")
-                                break
                 except Exception as ps_error:
-                    logger.warning(f"PowerShell check failed: {ps_error}")
-                
-            # Check one more time with detailed diagnostics
-            if not device_connected:
-                logger.warning("No device detected. Running diagnostic check...")
-                try:
-                    adb_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "platform-tools" / "adb.exe"
-                    if not adb_path.exists():
-                        adb_path = Path("C:/LDPlayer/LDPlayer9/adb.exe")
-                    if adb_path.exists():
-                        result = subprocess.run(
-                            [str(adb_path), "devices", "-l"],  # -l shows more details
-                            capture_output=True,
-                            text=True,
-                            timeout=5
-                        )
-                        logger.info(f"Current ADB devices status:\n{result.stdout}")
-                        if result.stderr:
-                            logger.warning(f"ADB stderr: {result.stderr}")
-                except Exception as diag_error:
-                    logger.debug(f"Diagnostic check failed: {diag_error}")
+                    logger.warning("PowerShell check failed: %s", ps_error)
+            
+            logger.debug("ADB devices output: %s", devices_output)
+            device_id = parse_ready_device(devices_output)
+            if device_id:
+                device_connected = True
+                logger.info("[OK] Android device is connected: %s", device_id)
+            else:
+                logger.warning("No device detected.")
+                logger.info("Current ADB devices status:\n%s", devices_output)
             
             if not device_connected:
                 logger.error("")
@@ -1366,8 +2096,8 @@ def main():
                         logger.info("Attempting to automatically start the first emulator...")
                         
                         # Try to start the first emulator automatically
-                        emulator_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "emulator" / "emulator.exe"
-                        if emulator_path.exists():
+                        emulator_path = _resolve_emulator_path()
+                        if emulator_path is not None:
                             try:
                                 logger.info(f"Starting emulator: {avds[0]}")
                                 # Start emulator in background
@@ -1376,122 +2106,81 @@ def main():
                                     stdout=subprocess.PIPE,
                                     stderr=subprocess.PIPE,
                                     stdin=subprocess.DEVNULL,
-                                    creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+                                    creationflags=_CREATE_NO_WINDOW
                                 )
                                 
                                 logger.info("Waiting for emulator to boot (this may take 60-120 seconds)...")
                                 
-                                # Wait for emulator to appear in adb devices (max 180 seconds = 3 minutes)
-                                max_wait = 180  # Increased from 90 to 180 seconds
+                                # OPTIMIZED: `adb wait-for-device` blocks until the emulator's transport is up,
+                                # so there is no 5-second sleep loop spawning `adb devices` up to 36 times.
+                                # The wait is only interrupted for the progress log (max 180 seconds = 3 minutes)
+                                max_wait = 180
                                 waited = 0
-                                check_interval = 5  # Check every 5 seconds instead of 3
-                                
-                                while waited < max_wait:
-                                    time.sleep(check_interval)
-                                    waited += check_interval
-                                    
-                                    if waited % 15 == 0:  # Log every 15 seconds
-                                        logger.info(f"  Still waiting for emulator to boot... ({waited}/{max_wait} seconds)")
-                                    
-                                    # Check if emulator is connected
-                                    adb_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "platform-tools" / "adb.exe"
-                                    if not adb_path.exists():
-                                        adb_path = Path("C:/LDPlayer/LDPlayer9/adb.exe")
-                                    
-                                    if adb_path.exists():
+                                progress_interval = 15
+                                transport_up = False
+                                if adb_path is not None:
+                                    wait_process = subprocess.Popen(
+                                        [str(adb_path), "wait-for-device"],
+                                        stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL,
+                                        stdin=subprocess.DEVNULL,
+                                        creationflags=_CREATE_NO_WINDOW
+                                    )
+                                    while True:
                                         try:
-                                            result = subprocess.run(
-                                                [str(adb_path), "devices"],
-                                                capture_output=True,
-                                                text=True,
-                                                timeout=3
-                                            )
-                                            devices_output = result.stdout
-                                            logger.debug(f"ADB devices output: {devices_output}")
-                                            lines = devices_output.strip().split('\n')
-                                            for line in lines[1:]:
-                                                if line.strip() and '\t' in line:
-                                                    parts = line.strip().split('\t')
-                                                    if len(parts) >= 2:
-                                                        device_id = parts[0]
-                                                        status = parts[1]
-                                                        
-                                                        # Check if it's an emulator (by ID pattern or name)
-                                                        is_emulator = 'emulator' in device_id.lower() or 'emulator' in line.lower() or device_id.startswith('emulator-')
-                                                        
-                                                        logger.debug(f"Found device: {device_id}, status: {status}, is_emulator: {is_emulator}")
-                                                        
-                                                        if status == 'device':
-                                                            # Accept any device with 'device' status (emulator or physical device)
-                                                            # If we're waiting for an emulator, prefer emulators, but accept any device
-                                                            if is_emulator or not device_connected:
-                                                                logger.info(f"[OK] Device is ready! Device ID: {device_id}")
-                                                                device_connected = True
-                                                            
-                                                            # Open Doubble app on the emulator
-                                                            logger.info("Opening Doubble app on emulator...")
-                                                            try:
-                                                                # Try using ADB to launch the app
-                                                                app_result = subprocess.run(
-                                                                    [str(adb_path), "shell", "am", "start", "-a", "android.intent.action.MAIN", 
-                                                                     "-c", "android.intent.category.LAUNCHER", "dk.doubble.dating"],
-                                                                    capture_output=True,
-                                                                    text=True,
-                                                                    timeout=5
-                                                                )
-                                                                if app_result.returncode == 0 and "Error" not in app_result.stderr:
-                                                                    logger.info("[OK] Doubble app opened successfully!")
-                                                                    time.sleep(3)  # Give app time to launch
-                                                                else:
-                                                                    # Fallback: try monkey command
-                                                                    monkey_result = subprocess.run(
-                                                                        [str(adb_path), "shell", "monkey", "-p", "dk.doubble.dating", "-c", 
-                                                                         "android.intent.category.LAUNCHER", "1"],
-                                                                        capture_output=True,
-                                                                        text=True,
-                                                                        timeout=10
-                                                                    )
-                                                                    if monkey_result.returncode == 0:
-                                                                        logger.info("[OK] Doubble app opened via monkey command!")
-                                                                        time.sleep(3)
-                                                                    else:
-                                                                        logger.warning("Could not open Doubble app automatically, but emulator is ready")
-                                                            except Exception as app_error:
-                                                                logger.warning(f"Could not open Doubble app: {app_error}")
-                                                                logger.info("Emulator is ready - app will be opened later in the script")
-                                                            
-                                                            break
-                                                        elif status == 'offline':
-                                                            # Emulator is starting but not ready yet
-                                                            logger.debug(f"Emulator {device_id} is offline (still booting)...")
-                                                            break
-        
-                                            if device_connected:
+                                            transport_up = wait_process.wait(timeout=progress_interval) == 0
+                                            break
+                                        except subprocess.TimeoutExpired:
+                                            waited += progress_interval
+                                            if waited >= max_wait:
+                                                wait_process.kill()
+                                                wait_process.wait()
                                                 break
-                                        except Exception:
-                                            pass
+                                            logger.info(f"  Still waiting for emulator to boot... ({waited}/{max_wait} seconds)")
+                                
+                                if transport_up:
+                                    serial_result = subprocess.run(
+                                        [str(adb_path), "get-serialno"],
+                                        capture_output=True,
+                                        text=True,
+                                        timeout=3
+                                    )
+                                    device_id = serial_result.stdout.strip() or None
+                                    logger.info(f"[OK] Device is ready! Device ID: {device_id}")
+                                    device_connected = True
                                     
-                                    if waited % 15 == 0:  # Log every 15 seconds
-                                        logger.info(f"  Still waiting for emulator to boot... ({waited}/{max_wait} seconds)")
+                                    # Open Doubble app on the emulator
+                                    logger.info("Opening Doubble app on emulator...")
+                                    try:
+                                        # OPTIMIZED: One device-side script tries every launch method in order
+                                        app_rc, app_output = adb_shell.run(APP_LAUNCH_SCRIPT, timeout=15)
+                                        if app_rc == 0:
+                                            logger.info(f"[OK] Doubble app opened via {app_output.strip()}!")
+                                            wait_for_foreground(adb_shell)  # Give app time to launch
+                                        else:
+                                            logger.warning("Could not open Doubble app automatically, but emulator is ready")
+                                    except Exception as app_error:
+                                        logger.warning(f"Could not open Doubble app: {app_error}")
+                                        logger.info("Emulator is ready - app will be opened later in the script")
                                 
                                 if not device_connected:
                                     logger.warning("Emulator did not become ready within timeout period")
                                     logger.warning("You can start it manually with:")
-                                    logger.warning(f'  powershell -Command "& \'$env:LOCALAPPDATA\\Android\\Sdk\\emulator\\emulator.exe\' -avd {avds[0]}"')
+                                    logger.warning(_MANUAL_START_HINT, avds[0])
                                     logger.warning("Then wait for it to fully boot and run the script again")
                             except Exception as e:
                                 logger.warning(f"Failed to start emulator automatically: {e}")
                                 logger.info("You can start one manually with:")
-                                logger.info(f'  powershell -Command "& \'$env:LOCALAPPDATA\\Android\\Sdk\\emulator\\emulator.exe\' -avd {avds[0]}"')
+                                logger.info(_MANUAL_START_HINT, avds[0])
                         else:
                             logger.info("Emulator executable not found. You can start one manually with:")
-                            logger.info(f'  powershell -Command "& \'$env:LOCALAPPDATA\\Android\\Sdk\\emulator\\emulator.exe\' -avd {avds[0]}"')
+                            logger.info(_MANUAL_START_HINT, avds[0])
                 
                 # Only show error and return if device is still not connected
                 if not device_connected:
                     logger.error("")
                     logger.error("To check devices manually, run:")
-                    logger.error('  powershell -Command "& \'$env:LOCALAPPDATA\\Android\\Sdk\\platform-tools\\adb.exe\' devices"')
+                    logger.error(_MANUAL_DEVICES_HINT)
                     logger.error("")
                     logger.error("The device should show status 'device' (not 'offline' or 'unauthorized').")
                     logger.error("=" * 60)
@@ -1512,62 +2201,54 @@ def main():
         # Wait a bit and verify device is truly ready (not just detected by ADB)
         # Sometimes ADB shows device as "device" but it's still booting
         device_ready = False
-        max_ready_checks = 15  # Increased to 15 checks (wait up to 45 seconds)
-        for ready_check in range(max_ready_checks):
+        if adb_path is not None:
+            # OPTIMIZED: A running Doubble process means the device finished booting long ago -
+            # skip the boot wait entirely on warm re-runs
+            try:
+                pid_rc, pid_output = adb_shell.run("pidof dk.doubble.dating", timeout=2)
+                if pid_rc == 0 and pid_output.strip():
+                    logger.info("[OK] Doubble is already running - device is ready")
+                    device_ready = True
+            except Exception as e:
+                logger.debug("App process check error: %s", e)
+        
+        if adb_path is not None and not device_ready:
+            # OPTIMIZED: Wait on the device side - one `adb shell` that loops there until boot has
+            # finished, instead of up to 15 rounds of three getprop spawns with 3-second sleeps
+            try:
+                adb_shell.run(BOOT_WAIT_SCRIPT, timeout=45)  # Same 45 second budget as before
+            except subprocess.TimeoutExpired:
+                logger.info("Device still booting after 45 seconds")
+            except Exception as e:
+                logger.debug("Boot wait error: %s", e)
+            
+            # Verify once (and report which condition is still pending)
             try:
-                adb_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "platform-tools" / "adb.exe"
-                if not adb_path.exists():
-                    adb_path = Path("C:/LDPlayer/LDPlayer9/adb.exe")
+                # OPTIMIZED: All three properties in one `adb shell` round-trip, separated by ---
+                props_rc, props_output = adb_shell.run(BOOT_PROPS_SCRIPT, timeout=5)
+                boot_prop, input_prop, anim_prop = [
+                    part.strip() for part in (props_output.split("---") + ["", ""])[:3]
+                ]
+                props_ok = props_rc == 0
                 
-                if adb_path.exists():
-                    # Check multiple properties to ensure device is fully ready
-                    try:
-                        # Check boot completed
-                        boot_result = subprocess.run(
-                            [str(adb_path), "shell", "getprop", "sys.boot_completed"],
-                            capture_output=True,
-                            text=True,
-                            timeout=3
-                        )
-                        # Check if device is ready for input
-                        input_result = subprocess.run(
-                            [str(adb_path), "shell", "getprop", "dev.bootcomplete"],
-                            capture_output=True,
-                            text=True,
-                            timeout=3
-                        )
-                        # Check if init.svc.bootanim is stopped (boot animation finished)
-                        anim_result = subprocess.run(
-                            [str(adb_path), "shell", "getprop", "init.svc.bootanim"],
-                            capture_output=True,
-                            text=True,
-                            timeout=3
-                        )
-                        
-                        boot_done = boot_result.returncode == 0 and boot_result.stdout.strip() == "1"
-                        input_ready = input_result.returncode == 0 and input_result.stdout.strip() == "1"
-                        anim_stopped = anim_result.returncode == 0 and anim_result.stdout.strip() == "stopped"
-                        
-                        if boot_done and input_ready and anim_stopped:
-                            logger.info("[OK] Device is fully booted and ready (all checks passed)")
-                            device_ready = True
-                            break
-                        else:
-                            status = []
-                            if not boot_done:
-                                status.append("boot not completed")
-                            if not input_ready:
-                                status.append("input not ready")
-                            if not anim_stopped:
-                                status.append(f"boot animation: {anim_result.stdout.strip()}")
-                            logger.info(f"Device still booting... (check {ready_check + 1}/{max_ready_checks}) - {', '.join(status) if status else 'checking...'}")
-                            time.sleep(3)  # Wait 3 seconds between checks
-                    except Exception as e:
-                        logger.debug(f"Device check error: {e}")
-                        time.sleep(3)
+                boot_done = props_ok and boot_prop == "1"  # Boot completed
+                input_ready = props_ok and input_prop == "1"  # Device ready for input
+                anim_stopped = props_ok and anim_prop == "stopped"  # Boot animation finished
+                
+                if boot_done and input_ready and anim_stopped:
+                    logger.info("[OK] Device is fully booted and ready (all checks passed)")
+                    device_ready = True
+                else:
+                    status = []
+                    if not boot_done:
+                        status.append("boot not completed")
+                    if not input_ready:
+                        status.append("input not ready")
+                    if not anim_stopped:
+                        status.append(f"boot animation: {anim_prop}")
+                    logger.info(f"Device still booting - {', '.join(status)}")
             except Exception as e:
-                logger.debug(f"ADB path check error: {e}")
-                time.sleep(3)
+                logger.debug("Device check error: %s", e)
         
         if not device_ready:
             logger.warning("Could not verify device boot status after all checks, but continuing anyway...")
@@ -1578,67 +2259,82 @@ def main():
         logger.info("(This may take 30-60 seconds to establish connection and install UiAutomator2)...")
         
         try:
-            # Add a timeout wrapper or at least log that we're attempting
-            import threading
+            def init_driver():
+                logger.info("Attempting to connect to Appium server...")
+                logger.info("(Installing UiAutomator2 server on device - this may take 30-60 seconds on first run)...")
+                # Import here to avoid circular imports
+                from drivers import get_driver
+                return get_driver()
             
-            driver_initialized = False
-            driver_result = None
-            driver_exception = None
+            def device_attached():
+                # `adb get-state` answers with a single token instead of the device listing
+                try:
+                    result = subprocess.run(
+                        [str(adb_path), "get-state"],
+                        capture_output=True,
+                        text=True,
+                        timeout=1
+                    )
+                    return result.stdout.strip() == "device"
+                except Exception:
+                    return True  # Ignore ADB check errors
             
-            def init_driver():
-                nonlocal driver_initialized, driver_result, driver_exception
+            # OPTIMIZED: Driver initialization completes a Future - result(timeout) wakes up the moment
+            # get_driver() returns instead of on the next 10-second join() tick. It runs on a daemon
+            # thread (not an executor worker) so a hung get_driver() never blocks interpreter exit
+            init_future = Future()
+            
+            def run_init():
+                if not init_future.set_running_or_notify_cancel():
+                    return
                 try:
-                    logger.info("Attempting to connect to Appium server...")
-                    logger.info("(Installing UiAutomator2 server on device - this may take 30-60 seconds on first run)...")
-                    # Import here to avoid circular imports
-                    from drivers import get_driver
-                    driver_result = get_driver()
-                    driver_initialized = True
-                    logger.info("[SUCCESS] Driver created successfully!")
-                except Exception as e:
-                    driver_exception = e
-                    driver_initialized = True
-                    logger.error(f"[ERROR] Driver initialization failed: {type(e).__name__}: {e}")
-                    import traceback
-                    logger.debug(f"Full traceback: {traceback.format_exc()}")
+                    init_future.set_result(init_driver())
+                except BaseException as e:
+                    init_future.set_exception(e)
             
-            # Start driver initialization in a thread
-            init_thread = threading.Thread(target=init_driver, daemon=True)
+            init_thread = threading.Thread(target=run_init, name="driver-init", daemon=True)
             init_thread.start()
+            # Progress health checks run side by side on their own pool
+            health_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="health-check")
             
             # Wait with timeout (120 seconds - increased for UiAutomator2 installation on first run)
-            # Check progress every 10 seconds
+            # Log progress every 10 seconds
             max_timeout = 120  # Increased from 60 to 120 seconds for first-time UiAutomator2 installation
             waited = 0
             check_interval = 10
-            while waited < max_timeout and not driver_initialized:
-                init_thread.join(timeout=check_interval)
-                waited += check_interval
-                if not driver_initialized and init_thread.is_alive():
+            driver = None
+            driver_exception = None
+            driver_timed_out = False
+            while True:
+                try:
+                    driver = init_future.result(timeout=check_interval)
+                    logger.info("[SUCCESS] Driver created successfully!")
+                    break
+                except FutureTimeoutError:
+                    waited += check_interval
+                    if waited >= max_timeout:
+                        driver_timed_out = True
+                        break
                     logger.info(f"Still initializing driver... ({waited}/{max_timeout} seconds)")
+                    # OPTIMIZED: Appium reachability and device state are independent - check both at once
+                    appium_check = health_executor.submit(check_appium_server_reachable)
+                    device_check = health_executor.submit(device_attached) if adb_path is not None else None
                     # Check if Appium server is still reachable
-                    if not check_appium_server_reachable():
+                    if not appium_check.result():
                         logger.warning("Appium server became unreachable during driver initialization!")
+                        driver_timed_out = True
                         break
                     # Check if device is still connected
-                    try:
-                        adb_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "platform-tools" / "adb.exe"
-                        if not adb_path.exists():
-                            adb_path = Path("C:/LDPlayer/LDPlayer9/adb.exe")
-                        if adb_path.exists():
-                            result = subprocess.run(
-                                [str(adb_path), "devices"],
-                                capture_output=True,
-                                text=True,
-                                timeout=2
-                            )
-                            if "device" not in result.stdout:
-                                logger.warning("Device disconnected during driver initialization!")
-                        break
-                    except Exception:
-                        pass  # Ignore ADB check errors
+                    if device_check is not None and not device_check.result():
+                        logger.warning("Device disconnected during driver initialization!")
+                except Exception as e:
+                    driver_exception = e
+                    logger.error(f"[ERROR] Driver initialization failed: {type(e).__name__}: {e}")
+                    logger.debug("Full traceback:", exc_info=True)
+                    break
+            health_executor.shutdown(wait=False)
             
-            if not driver_initialized:
+            if driver_timed_out:
                 logger.error("")
                 logger.error("=" * 60)
                 logger.error("ERROR: Driver Initialization Timed Out")
@@ -1650,10 +2346,7 @@ def main():
                 
                 # Try to diagnose the issue
                 try:
-                    adb_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "platform-tools" / "adb.exe"
-                    if not adb_path.exists():
-                        adb_path = Path("C:/LDPlayer/LDPlayer9/adb.exe")
-                    if adb_path.exists():
+                    if adb_path is not None:
                         # Check device status
                         result = subprocess.run(
                             [str(adb_path), "devices"],
@@ -1664,27 +2357,24 @@ def main():
                         logger.info(f"Current device status: {result.stdout}")
                         
                         # Check if device is fully booted
-                        boot_result = subprocess.run(
-                            [str(adb_path), "shell", "getprop", "sys.boot_completed"],
-                            capture_output=True,
-                            text=True,
-                            timeout=3
-                        )
-                        logger.info(f"Device boot status: {boot_result.stdout.strip()}")
+                        _, boot_output = adb_shell.run("getprop sys.boot_completed", timeout=3)
+                        logger.info(f"Device boot status: {boot_output.strip()}")
                 except Exception as e:
-                    logger.debug(f"Diagnostic check failed: {e}")
+                    logger.debug("Diagnostic check failed: %s", e)
                 
-                # Try one more time with a fresh attempt
+                # Try one more time - a still-running first attempt is given more time instead of
+                # racing a second get_driver() against it for the DriverFactory singleton
                 logger.info("")
-                logger.info("Retrying driver initialization (this may take another 60 seconds)...")
-                time.sleep(2)  # Brief pause before retry
-                
                 try:
-                    from drivers import get_driver
-                    driver = get_driver()
+                    if init_thread.is_alive():
+                        logger.info("Waiting on the pending driver initialization (up to another %d seconds)...", max_timeout)
+                        driver = init_future.result(timeout=max_timeout)
+                    else:
+                        logger.info("Retrying driver initialization (this may take another 60 seconds)...")
+                        time.sleep(2)  # Brief pause before retry
+                        from drivers import get_driver
+                        driver = get_driver()
                     logger.info("[SUCCESS] Driver created on retry!")
-                    driver_initialized = True
-                    driver_result = driver
                 except Exception as retry_error:
                     logger.error("")
                     logger.error("Retry also failed. This usually means:")
@@ -1722,7 +2412,6 @@ def main():
                 logger.error("=" * 60)
                 return 1
             
-            driver = driver_result
             logger.info("[OK] Driver initialized successfully")
             
         except Exception as e:
@@ -1740,6 +2429,8 @@ def main():
                 logger.error("Please check your device connection and Appium configuration.")
                 raise
         
+        apply_driver_settings(driver)
+        
         # Create page objects
         page = BasePage()
         screen_detector = DoubbleScreenDetector()
@@ -1758,8 +2449,12 @@ def main():
         logger.info("Checking if Doubble app is already open...")
         app_already_open = False
         try:
-            current_package = page.get_current_package()
-            current_activity = page.get_current_activity()
+            foreground_app = get_foreground_app(adb_shell) if adb_shell is not None else None
+            if foreground_app is not None:
+                current_package, current_activity = foreground_app
+            else:
+                current_package = page.get_current_package()
+                current_activity = page.get_current_activity()
             logger.info(f"Current app: {current_package}/{current_activity}")
             
             # Check if Doubble app is currently open
@@ -1775,12 +2470,8 @@ def main():
         if not app_launched:
             logger.info("App not open. Launching Doubble app...")
         
-        # Find ADB path
-        adb_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "platform-tools" / "adb.exe"
-        if not adb_path.exists():
-            adb_path = Path("C:/LDPlayer/LDPlayer9/adb.exe")
-        
-        if not adb_path.exists():
+        # adb_path was resolved during device detection
+        if adb_path is None:
             logger.warning("ADB not found in standard locations. Trying Appium activate_app()...")
             try:
                 driver.activate_app("dk.doubble.dating")
@@ -1796,61 +2487,22 @@ def main():
                 driver.activate_app("dk.doubble.dating")
                 logger.info("[OK] App activated using activate_app()")
                 app_launched = True
-                time.sleep(3)
+                wait_for_foreground(adb_shell)
             except Exception as e:
                 logger.info(f"activate_app failed, trying ADB methods...")
-        
-                # Try launcher intent (Android finds activity automatically)
-                logger.info("Trying launcher intent...")
-            result = subprocess.run(
-                [str(adb_path), "shell", "am", "start", "-a", "android.intent.action.MAIN", 
-                 "-c", "android.intent.category.LAUNCHER", "dk.doubble.dating"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0 and "Error" not in result.stderr:
-                logger.info("[OK] App launched via launcher intent")
-                app_launched = True
-                time.sleep(3)
-        
-                # Try monkey command if launcher intent failed
-        if not app_launched:
-            logger.info("Trying ADB monkey command...")
-            result = subprocess.run(
-                [str(adb_path), "shell", "monkey", "-p", "dk.doubble.dating", "-c", 
-                 "android.intent.category.LAUNCHER", "1"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                logger.info("[OK] App launched via ADB monkey command")
-                app_launched = True
-                time.sleep(3)
-        
-                    # Try common activity names as last resort
-        if not app_launched:
-            logger.info("Trying common activity names...")
-            common_activities = [
-                ".MainActivity",
-                ".ui.MainActivity",
-                ".SplashActivity", 
-                ".LaunchActivity",
-            ]
             
-            for activity in common_activities:
-                result = subprocess.run(
-                    [str(adb_path), "shell", "am", "start", "-n", f"dk.doubble.dating/{activity}"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0 and "Error" not in result.stderr and "does not exist" not in result.stderr:
-                    logger.info(f"[OK] App launched with activity: {activity}")
-                    app_launched = True
-                    time.sleep(3)
-                    break
+            # OPTIMIZED: Launcher intent, monkey and common activity names in one device-side
+            # script that stops at the first success (one round-trip instead of up to 6 commands)
+            if not app_launched:
+                logger.info("Trying ADB launch methods (launcher intent, monkey, common activities)...")
+                try:
+                    launch_rc, launch_output = adb_shell.run(APP_LAUNCH_SCRIPT, timeout=15)
+                    if launch_rc == 0:
+                        logger.info(f"[OK] App launched via {launch_output.strip()}")
+                        app_launched = True
+                        wait_for_foreground(adb_shell)
+                except Exception as e:
+                    logger.warning(f"ADB launch failed: {e}")
         
         # If still not launched, just continue - app might already be open or user can open it manually
         if not app_launched:
@@ -1866,6 +2518,10 @@ def main():
         else:
             logger.info("[OK] Continuing - assuming app will be available...")
         
+        # Startup shell commands are done - release the persistent adb shell
+        if adb_shell is not None:
+            adb_shell.close()
+        
         # Wait for app to load (if we just launched it)
         # OPTIMIZED: Minimal wait times
         if app_launched and not app_already_open:
@@ -1880,106 +2536,112 @@ def main():
         logger.info("=" * 60)
         
         current_screen = "unknown"
-        try:
-            # CRITICAL FIX: Check for swipe screen elements FIRST (most reliable)
-            # Activity name can be ambiguous - .MainActivity might be used for multiple screens
-            
-            # Strategy 1: Check for like button (most reliable swipe screen indicator)
-            try:
-                if swipe_page.is_element_present_silent("xpath", "//*[contains(@content-desc, 'Like') or contains(@content-desc, 'like')]", timeout=0.1):
-                    current_screen = "swipe"
-                    logger.info("[FAST] Detected SWIPE screen from like button!")
-                    # Get activity for logging
+        # OPTIMIZED: One parsed page source shared by detection, the initial pop-up check
+        # and the navigation entry check (refetched only after a tap or once stale)
+        tree = TreeCache(page.driver)
+        snapshot = None
+        
+        # ULTRA-FAST: A run that ended on the swipe screen moments ago left the app there (and
+        # free of pop-ups) - skip detection and the pop-up check entirely
+        if app_already_open and load_screen_state() == "swipe":
+            current_screen = "swipe"
+            logger.info(f"[FAST] Previous run ended on SWIPE screen less than {SCREEN_STATE_MAX_AGE}s ago - skipping detection")
+        
+        # OPTIMIZED: Implicit wait off for the whole detection round - the probes below carry
+        # their own tiny timeouts
+        if current_screen == "unknown":
+            with _no_implicit(page.driver):
+                try:
+                    # OPTIMIZED: Current activity fetched once per round (logging + Strategy 3)
                     try:
                         current_activity = page.get_current_activity()
-                        logger.info(f"Current Activity: {current_activity}")
-                    except:
-                        pass
-            except:
-                pass
-            
-            # Strategy 2: Check for swipe-specific UI elements (card stack, discover, etc.)
-            if current_screen == "unknown":
-                try:
-                    # Check for multiple swipe screen indicators with higher confidence
-                    swipe_indicators = [
-                        ("xpath", "//*[contains(@content-desc, 'Swipe') or contains(@content-desc, 'swipe')]"),
-                        ("xpath", "//*[contains(@content-desc, 'Discover') or contains(@content-desc, 'discover')]"),
-                        ("xpath", "//*[contains(@content-desc, 'Explore') or contains(@content-desc, 'explore')]"),
-                        ("xpath", "//*[@class='androidx.cardview.widget.CardView']"),  # Card stack
-                        ("xpath", "//*[contains(@class, 'Card') or contains(@class, 'card')]"),
-                    ]
+                    except Exception:
+                        current_activity = ""
+                    activity_lower = str(current_activity).lower()
                     
-                    found_indicators = 0
-                    for loc_type, loc_value in swipe_indicators[:3]:  # Check top 3
-                        try:
-                            if swipe_page.is_element_present_silent(loc_type, loc_value, timeout=0.05):
-                                found_indicators += 1
-                        except:
-                            continue
+                    # ULTRA-FAST: Cheapest check first - a definitive activity name settles the screen
+                    # without any element probes
+                    for activity_suffix, screen in DEFINITIVE_ACTIVITY_SCREENS:
+                        if str(current_activity).endswith(activity_suffix):
+                            current_screen = screen
+                            logger.info(f"[FAST] Detected {screen.upper()} screen from activity name: {current_activity}")
+                            break
+                    
+                    # OPTIMIZED: One page_source fetch per detection round - every probe below is then an
+                    # in-process XPath evaluation instead of a device round-trip (live probes without lxml).
+                    # Only needed when the activity name was ambiguous
+                    snapshot = tree.root() if current_screen == "unknown" else None
                     
-                    # If we found at least 1 swipe indicator, likely on swipe screen
-                    if found_indicators > 0:
-                        current_screen = "swipe"
-                        logger.info(f"[FAST] Detected SWIPE screen from {found_indicators} swipe indicator(s)!")
+                    def present(query, selector, timeout):
+                        if snapshot is not None:
+                            return bool(query(snapshot))
+                        return swipe_page.is_element_present_silent("android_uiautomator", selector, timeout=timeout)
+                    
+                    # OPTIMIZED: The like button is probed once per round - the activity-based
+                    # fallbacks below reuse this result instead of re-checking
+                    has_like = False
+                    if current_screen == "unknown":
                         try:
-                            current_activity = page.get_current_activity()
-                            logger.info(f"Current Activity: {current_activity}")
-                        except:
+                            has_like = present(_LIKE_QUERY, LIKE_SELECTOR, 0.1)
+                        except Exception:
                             pass
-                except:
-                    pass
-            
-            # Strategy 3: Activity-based detection (less reliable - only as fallback)
-            if current_screen == "unknown":
-                try:
-                    current_activity = page.get_current_activity()
-                    logger.info(f"Current Activity: {current_activity}")
                     
-                    activity_lower = str(current_activity).lower()
-                    if "swipe" in activity_lower or "discover" in activity_lower:
-                        current_screen = "swipe"
-                        logger.info("[FAST] Detected SWIPE from activity name")
-                    elif "match" in activity_lower or "like" in activity_lower:
-                        # This might be matches/likes screen, not swipe screen
-                        logger.warning("[INFO] Activity suggests MATCHES/LIKES screen - checking elements...")
-                        # Still check for like button - might be on swipe after all
+                    # CRITICAL FIX: Check for swipe screen elements FIRST (most reliable)
+                    # Activity name can be ambiguous - .MainActivity might be used for multiple screens
+                    
+                    # Strategy 1: Check for like button (most reliable swipe screen indicator)
+                    try:
+                        if has_like:
+                            current_screen = "swipe"
+                            logger.info("[FAST] Detected SWIPE screen from like button!")
+                            logger.info(f"Current Activity: {current_activity}")
+                    except:
+                        pass
+                    
+                    # Strategy 2: Check for swipe-specific UI elements (card stack, discover, etc.)
+                    if current_screen == "unknown":
                         try:
-                            if swipe_page.is_element_present_silent("xpath", "//*[contains(@content-desc, 'Like') or contains(@content-desc, 'like')]", timeout=0.1):
+                            # OPTIMIZED: All swipe screen indicators in a single OR'd query
+                            if present(_SWIPE_INDICATOR_QUERY, SWIPE_INDICATOR_SELECTOR, 0.05):
                                 current_screen = "swipe"
-                                logger.info("[FAST] Actually on SWIPE screen (found like button despite activity name)")
+                                logger.info("[FAST] Detected SWIPE screen from swipe indicators!")
+                                logger.info(f"Current Activity: {current_activity}")
                         except:
                             pass
-                    elif "main" in activity_lower or "home" in activity_lower:
-                        # Activity says main/home, but could still be swipe screen - CHECK ELEMENTS
-                        logger.info("[INFO] Activity suggests HOME/MAIN - verifying with elements...")
-                        # Double-check with elements - don't trust activity name alone
+                    
+                    # Strategy 3: Activity-based detection (less reliable - only as fallback)
+                    if current_screen == "unknown":
                         try:
-                            if swipe_page.is_element_present_silent("xpath", "//*[contains(@content-desc, 'Like') or contains(@content-desc, 'like')]", timeout=0.1):
+                            logger.info(f"Current Activity: {current_activity}")
+                            
+                            if "swipe" in activity_lower or "discover" in activity_lower:
                                 current_screen = "swipe"
-                                logger.info("[FAST] Actually on SWIPE screen (found like button - activity name was misleading)")
-                            else:
+                                logger.info("[FAST] Detected SWIPE from activity name")
+                            elif "match" in activity_lower or "like" in activity_lower:
+                                # This might be matches/likes screen, not swipe screen
+                                # (no like button - Strategy 1 would have caught it)
+                                logger.warning("[INFO] Activity suggests MATCHES/LIKES screen")
+                            elif "main" in activity_lower or "home" in activity_lower:
+                                # Activity says main/home - confirmed by the like-button probe above
+                                # (don't trust activity name alone)
                                 current_screen = "home"
                                 logger.info("[INFO] Confirmed HOME screen (no swipe elements found)")
                         except:
-                            current_screen = "home"
-                            logger.info("[INFO] Assuming HOME screen (element check failed)")
-                except:
-                    pass
-            
-            # Brief logging
-            if current_screen == "home":
-                logger.info("[INFO] On HOME screen - will navigate to swipe screen")
-            elif current_screen == "swipe":
-                logger.info("[INFO] Detection shows SWIPE screen - skipping navigation")
-            elif current_screen == "login":
-                logger.warning("[WARNING] On LOGIN screen - need to log in first")
-            else:
-                logger.info(f"[INFO] Screen unknown - will attempt navigation")
-            
-        except Exception as e:
-            logger.warning(f"Error during screen detection: {e}")
-            logger.info("Will attempt to continue and navigate to swipe screen...")
+                            pass
+                    
+                    # Brief logging
+                    if current_screen == "home":
+                        logger.info("[INFO] On HOME screen - will navigate to swipe screen")
+                    elif current_screen == "swipe":
+                        logger.info("[INFO] Detection shows SWIPE screen - skipping navigation")
+                    elif current_screen == "login":
+                        logger.warning("[WARNING] On LOGIN screen - need to log in first")
+                    else:
+                        logger.info(f"[INFO] Screen unknown - will attempt navigation")
+                    
+                except Exception as e:
+                    logger.warning(f"Error during screen detection: {e}")
+                    logger.info("Will attempt to continue and navigate to swipe screen...")
         
         logger.info("=" * 60)
         
@@ -1993,28 +2655,49 @@ def main():
         if current_screen != "swipe":
             # Not on swipe screen - need to navigate
             # Handle any initial pop-ups (silent mode - no error logging)
-            dismissed = swipe_page.handle_popups_quiet()
+            # Reuses the page source parsed during screen detection (when still fresh)
+            dismissed = swipe_page.handle_popups_quiet(root=tree.root())
             if dismissed > 0:
+                tree.invalidate()
                 logger.info(f"[!] Dismissed {dismissed} initial pop-up(s)")
             # OPTIMIZED: Removed wait - not needed
             
             # Navigate to swipe screen
             logger.info("Navigating to swipe screen...")
-            navigation_success = ensure_on_swipe_screen(page, screen_detector, swipe_page)
+            navigation_success = ensure_on_swipe_screen(page, screen_detector, swipe_page, tree)
             
-            if not navigation_success:
+            if navigation_success:
+                current_screen = "swipe"
+            else:
                 logger.warning("Navigation may not have succeeded, but continuing anyway...")
                 logger.warning("If the script doesn't work, please manually navigate to swipe screen.")
-                time.sleep(0.5)  # Reduced from 1s to 0.5s
+                # OPTIMIZED: Bounded wait that returns as soon as the like button shows up
+                # instead of always sleeping 0.5s
+                try:
+                    with _no_implicit(page.driver):
+                        WebDriverWait(page.driver, 0.5, poll_frequency=0.05).until(
+                            lambda d: d.find_elements(AppiumBy.ANDROID_UIAUTOMATOR, LIKE_SELECTOR)
+                        )
+                except (TimeoutException, WebDriverException):
+                    pass
         
         # Do 5 swipes first, then navigate to matches and send messages
         logger.info("Starting: 5 swipes, then navigate to matches...")
-        swipe_and_like_loop(swipe_page, page, max_iterations=5)  # Do exactly 5 swipes
+        _swipe_loop_active = True
+        final_screen = current_screen
+        try:
+            swipe_and_like_loop(swipe_page, page, max_iterations=5)  # Do exactly 5 swipes
+        finally:
+            _swipe_loop_active = False
+        if shutdown_event.is_set():
+            logger.info("\nInterrupted by user")
+            return 0
         
         # After 5 swipes, navigate to matches and send messages
         logger.info("=" * 60)
         logger.info("5 swipes completed! Navigating to matches...")
         logger.info("=" * 60)
+        final_screen = "unknown"  # Leaving the swipe screen
         navigate_to_matches_and_send_message(page, swipe_page)
         
         logger.info("Automation completed successfully!")
@@ -2048,6 +2731,7 @@ def main():
         return 1
     finally:
         logger.info("Cleaning up...")
+        save_screen_state(final_screen)
         close_driver()
         # Only stop Appium if we started it (don't stop if it was already running)
         # We track this with the _appium_process global variable
@@ -2056,5 +2740,6 @@ def main():
 
 
 if __name__ == "__main__":
+    start_log_listener()
     sys.exit(main())
 
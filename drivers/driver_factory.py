@@ -2,29 +2,124 @@
 
 import os
 import socket
+import urllib3
 import yaml
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Any
+from types import MappingProxyType
+from typing import Optional, Any, Mapping, Tuple
+from urllib.parse import urlsplit
 
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
+from appium.webdriver.appium_connection import AppiumConnection
 from appium.webdriver.common.appiumby import AppiumBy
 
+# Resolved to an absolute path once at import - unaffected by later working-directory changes
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "settings.yaml"
+
+# libyaml's C parser when PyYAML was built with it (several times faster than the pure-Python loader)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=1)
+def _load_settings() -> Mapping:
+    """
+    Parse settings.yaml once per process.
+    
+    Returns:
+        Mapping: Read-only view of the parsed configuration (shared by all callers)
+    """
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        return MappingProxyType(yaml.load(f, Loader=_YamlLoader))
+
+
+@lru_cache(maxsize=1)
+def _appium_address() -> Tuple[str, int]:
+    """
+    Host and port of the configured Appium server (parsed once).
+    
+    Returns:
+        tuple: (host, port) - defaults to localhost:4723 for missing parts
+    """
+    parts = urlsplit(_load_settings()["appium"]["server_url"])
+    return parts.hostname or "localhost", parts.port or 4723  # Default Appium port
+
+
+@lru_cache(maxsize=1)
+def _appium_status_path() -> str:
+    """
+    Path of the configured Appium server's /status endpoint, honouring any base path.
+    
+    Returns:
+        str: e.g. "/status" or "/wd/hub/status"
+    """
+    return urlsplit(_load_settings()["appium"]["server_url"]).path.rstrip("/") + "/status"
+
 
 class DriverFactory:
     """Factory class for creating Appium WebDriver instances."""
     
+    __slots__ = ()  # Class-level state only - instances carry no __dict__
+    
     _driver: Optional[Any] = None
-    _config: dict = None
+    _server_alive: bool = False  # Set after a successful server check, cleared on driver failure/close
+    _http_pool: Optional[urllib3.PoolManager] = None
+    
+    @classmethod
+    def load_config(cls) -> Mapping:
+        """Load configuration from settings.yaml (parsed once, shared read-only)."""
+        return _load_settings()
+    
+    @classmethod
+    def get_http_pool(cls) -> urllib3.PoolManager:
+        """
+        Get the shared HTTP connection pool used for all Appium commands (created once).
+        
+        Keep-alive connections are reused across commands and across driver re-creation,
+        so the tight swipe loop never pays a TCP handshake per command. TCP_NODELAY keeps
+        the small JSON requests from being delayed by Nagle's algorithm. Retries are off
+        (Retry(total=0)): a reset connection surfaces at once as a connection error and is
+        handled by the caller's reconnect logic instead of urllib3's default retries.
+        
+        Returns:
+            urllib3.PoolManager: Shared connection pool
+        """
+        if cls._http_pool is None:
+            cls._http_pool = urllib3.PoolManager(
+                num_pools=1,
+                maxsize=16,
+                block=False,
+                retries=urllib3.Retry(total=0),
+                socket_options=[
+                    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+                    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+                ],
+            )
+        return cls._http_pool
     
     @classmethod
-    def load_config(cls) -> dict:
-        """Load configuration from settings.yaml."""
-        if cls._config is None:
-            config_path = Path(__file__).parent.parent / "config" / "settings.yaml"
-            with open(config_path, "r", encoding="utf-8") as f:
-                cls._config = yaml.safe_load(f)
-        return cls._config
+    def create_connection(cls, server_url: str) -> AppiumConnection:
+        """
+        Create the keep-alive command executor for a new driver session.
+        
+        The connection is built up front and handed to webdriver.Remote, so the
+        new-session request and every later command (including after a reconnect)
+        go through the same shared pool - one persistent TCP connection to Appium
+        instead of a handshake per command.
+        
+        Args:
+            server_url: Appium server URL (e.g. "http://localhost:4723")
+            
+        Returns:
+            AppiumConnection: Command executor bound to the shared HTTP pool
+        """
+        connection = AppiumConnection(server_url, keep_alive=True)
+        # The client exposes no public hook for handing in an existing pool, so the private
+        # attribute is swapped - only when this client version still has it
+        if hasattr(connection, "_conn"):
+            connection._conn = cls.get_http_pool()
+        return connection
     
     @classmethod
     def check_appium_server(cls) -> bool:
@@ -34,30 +129,16 @@ class DriverFactory:
         Returns:
             bool: True if server is reachable, False otherwise
         """
+        # OPTIMIZED: Once the server answered, later checks are skipped until driver creation
+        # fails or the driver is closed (e.g. by a reconnect)
+        if cls._server_alive:
+            return True
         try:
-            config = cls.load_config()
-            appium_config = config["appium"]
-            server_url = appium_config["server_url"]
-            
-            # Extract host and port from URL (e.g., "http://localhost:4723")
-            if "://" in server_url:
-                host_port = server_url.split("://")[1]
-                if ":" in host_port:
-                    host, port = host_port.split(":")
-                    port = int(port)
-                else:
-                    host = host_port
-                    port = 4723  # Default Appium port
-            else:
-                host = "localhost"
-                port = 4723
-            
-            # Quick socket check
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)  # 2 second timeout
-            result = sock.connect_ex((host, port))
-            sock.close()
-            return result == 0
+            # Appium is local - a short connect timeout is plenty
+            with socket.create_connection(_appium_address(), timeout=0.5):
+                pass
+            cls._server_alive = True
+            return True
         except Exception:
             return False
     
@@ -119,7 +200,7 @@ class DriverFactory:
         # Create driver
         try:
             cls._driver = webdriver.Remote(
-                command_executor=appium_config["server_url"],
+                command_executor=cls.create_connection(appium_config["server_url"]),
                 options=options
             )
             
@@ -129,6 +210,8 @@ class DriverFactory:
             
             return cls._driver
         except Exception as e:
+            # The server may have gone away - re-run the fast preflight on the next attempt
+            cls._server_alive = False
             raise Exception(f"Failed to create Appium driver: {str(e)}")
     
     @classmethod
@@ -141,6 +224,7 @@ class DriverFactory:
     @classmethod
     def close_driver(cls):
         """Close and cleanup the driver instance."""
+        cls._server_alive = False  # The next driver re-checks the server
         if cls._driver is not None:
             try:
                 cls._driver.quit()
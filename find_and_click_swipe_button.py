@@ -3,10 +3,16 @@ Script to find and click the swipe button in Doubble app.
 Uses UI hierarchy analysis to locate the button.
 """
 
+import re
 import sys
 import time
 import xml.etree.ElementTree as ET
 from pathlib import Path
+try:
+    # lxml (libxml2) evaluates the whole button search as one compiled XPath in C
+    from lxml import etree
+except ImportError:
+    etree = None
 
 # Add project root to path
 project_root = Path(__file__).parent
@@ -23,6 +29,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Keywords marking a swipe/start button (matched case-insensitively in text / content-desc)
+SWIPE_KEYWORDS = ('swipe', 'start', 'begin', 'go')
+
+# OPTIMIZED: All keywords in one case-insensitive regex - a single C-level scan per attribute
+_SWIPE_KEYWORD_RE = re.compile('|'.join(SWIPE_KEYWORDS), re.I)
+
+# Element bounds attribute: "[x1,y1][x2,y2]"
+_BOUNDS_RE = re.compile(r'\[(\d+),(\d+)\]\[(\d+),(\d+)\]')
+
+_UPPERCASE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_LOWERCASE = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def _lowered(attribute: str) -> str:
+    """XPath 1.0 expression for the lowercased value of an attribute."""
+    return f"translate({attribute}, '{_UPPERCASE}', '{_LOWERCASE}')"
+
+
+# OPTIMIZED: Buttons whose text or content-desc contains a swipe keyword, as one compiled
+# XPath - replaces a Python-level iteration over every element of the UI dump
+if etree is not None:
+    SWIPE_BUTTON_QUERY = etree.XPath(
+        "//*[contains({cls}, 'button') and ({keywords})]".format(
+            cls=_lowered('@class'),
+            keywords=' or '.join(
+                f"contains({_lowered('@text')}, '{keyword}') or contains({_lowered('@content-desc')}, '{keyword}')"
+                for keyword in SWIPE_KEYWORDS
+            ),
+        )
+    )
+else:
+    SWIPE_BUTTON_QUERY = None
+
 
 def get_ui_hierarchy(driver):
     """
@@ -32,17 +71,9 @@ def get_ui_hierarchy(driver):
         str: UI hierarchy XML content
     """
     try:
-        # Use ADB to get UI hierarchy
-        import subprocess
-        adb_path = Path.home() / "AppData" / "Local" / "Android" / "Sdk" / "platform-tools" / "adb.exe"
-        
-        if not adb_path.exists():
-            # Try alternative path
-            adb_path = Path(os.environ.get('LOCALAPPDATA', '')) / "Android" / "Sdk" / "platform-tools" / "adb.exe"
-        
-        # Get UI dump via Appium
-        source = driver.page_source
-        return source
+        # OPTIMIZED: Straight from Appium - the adb path probing that used to run first was
+        # never used (and did two disk stats per call)
+        return driver.page_source
     except Exception as e:
         logger.error(f"Error getting UI hierarchy: {e}")
         return None
@@ -97,29 +128,48 @@ def find_swipe_button(page):
     
     # Strategy 3: Get UI hierarchy and analyze
     logger.info("Getting UI hierarchy for analysis...")
+    root = None
     try:
         driver = page.driver
         source = driver.page_source
         
+        # OPTIMIZED: Parsed once (libxml2 when available) - Strategy 4 reuses the same tree
         if source:
-            # Parse XML
-            root = ET.fromstring(source)
-            
+            root = (etree if etree is not None else ET).fromstring(source.encode('utf-8'))
+        
+        if root is not None and SWIPE_BUTTON_QUERY is not None:
+            # First matching button straight from libxml2
+            matches = SWIPE_BUTTON_QUERY(root)
+            if matches:
+                elem = matches[0]
+                resource_id = elem.get('resource-id', '').lower()
+                content_desc = elem.get('content-desc', '').lower()
+                text = elem.get('text', '').lower()
+                if resource_id:
+                    logger.info(f"Found potential swipe button with resource-id: {resource_id}")
+                    return ("id", resource_id)
+                elif content_desc:
+                    logger.info(f"Found potential swipe button with content-desc: {content_desc}")
+                    return ("accessibility_id", content_desc)
+                elif text:
+                    xpath = f"//*[@text='{elem.get('text')}']"
+                    logger.info(f"Found potential swipe button with text: {text}")
+                    return ("xpath", xpath)
+        elif root is not None:
             # Search for elements with swipe-related attributes
             for elem in root.iter():
-                text = elem.get('text', '').lower()
-                content_desc = elem.get('content-desc', '').lower()
-                resource_id = elem.get('resource-id', '').lower()
-                class_name = elem.get('class', '').lower()
-                
                 # Check if it's a button
-                is_button = 'button' in class_name or 'Button' in class_name
-                
-                # Check for swipe-related keywords
-                has_swipe_keyword = any(keyword in text or keyword in content_desc 
-                                      for keyword in ['swipe', 'start', 'begin', 'go'])
+                if 'button' not in elem.get('class', '').lower():
+                    continue
                 
-                if is_button and has_swipe_keyword:
+                # Check for swipe-related keywords (regex is case-insensitive - no lowering needed)
+                text = elem.get('text', '')
+                content_desc = elem.get('content-desc', '')
+                if _SWIPE_KEYWORD_RE.search(text) or _SWIPE_KEYWORD_RE.search(content_desc):
+                    text = text.lower()
+                    content_desc = content_desc.lower()
+                    resource_id = elem.get('resource-id', '').lower()
+                    
                     # Try to get a locator
                     if resource_id:
                         logger.info(f"Found potential swipe button with resource-id: {resource_id}")
@@ -135,38 +185,39 @@ def find_swipe_button(page):
         logger.warning(f"Error analyzing UI hierarchy: {e}")
     
     # Strategy 4: Try to find any large clickable button
+    # OPTIMIZED: Bounds, text, resource-id and content-desc come from the page source already
+    # parsed for Strategy 3 - no per-element location/size/attribute HTTP round-trips
     logger.info("Trying to find any large clickable button...")
     try:
-        # Get all clickable elements
-        driver = page.driver
-        elements = driver.find_elements("xpath", "//*[@clickable='true']")
+        if root is None:
+            root = (etree if etree is not None else ET).fromstring(page.driver.page_source.encode('utf-8'))
         
-        for elem in elements:
-            try:
-                # Get element bounds
-                location = elem.location
-                size = elem.size
-                area = size['width'] * size['height']
-                
-                # Prefer larger buttons (likely to be main action button)
-                if area > 10000:  # At least 100x100 pixels
-                    text = elem.text or elem.get_attribute('content-desc') or ''
-                    logger.info(f"Found large clickable element: {text} (area: {area})")
-                    
-                    # Try to get a locator
-                    resource_id = elem.get_attribute('resource-id')
-                    if resource_id:
-                        return ("id", resource_id)
-                    
-                    content_desc = elem.get_attribute('content-desc')
-                    if content_desc:
-                        return ("accessibility_id", content_desc)
-                    
-                    if text:
-                        xpath = f"//*[@text='{text}']"
-                        return ("xpath", xpath)
-            except:
+        for elem in root.iter():
+            if elem.get('clickable') != 'true':
+                continue
+            bounds = _BOUNDS_RE.match(elem.get('bounds', ''))
+            if bounds is None:
                 continue
+            x1, y1, x2, y2 = map(int, bounds.groups())
+            area = (x2 - x1) * (y2 - y1)
+            
+            # Prefer larger buttons (likely to be main action button)
+            if area > 10000:  # At least 100x100 pixels
+                text = elem.get('text') or elem.get('content-desc') or ''
+                logger.info(f"Found large clickable element: {text} (area: {area})")
+                
+                # Try to get a locator
+                resource_id = elem.get('resource-id')
+                if resource_id:
+                    return ("id", resource_id)
+                
+                content_desc = elem.get('content-desc')
+                if content_desc:
+                    return ("accessibility_id", content_desc)
+                
+                if text:
+                    xpath = f"//*[@text='{text}']"
+                    return ("xpath", xpath)
     except Exception as e:
         logger.warning(f"Error finding clickable elements: {e}")
     
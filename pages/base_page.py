@@ -1,12 +1,18 @@
 """Base page class with common UI interaction methods."""
 
+import json
 import time
+from types import MappingProxyType
 from typing import Optional, Tuple
 from appium.webdriver import WebElement
 from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.webdriver.common.actions import interaction
+from selenium.webdriver.common.actions.action_builder import ActionBuilder
+from selenium.webdriver.common.actions.mouse_button import MouseButton
+from selenium.webdriver.common.actions.pointer_input import PointerInput
 
 from drivers import get_driver
 import logging
@@ -14,10 +20,51 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# String locator types -> AppiumBy constants (shared, read-only)
+_LOCATOR_MAP = MappingProxyType({
+    "id": AppiumBy.ID,
+    "xpath": AppiumBy.XPATH,
+    "class_name": AppiumBy.CLASS_NAME,
+    "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
+    "android_uiautomator": AppiumBy.ANDROID_UIAUTOMATOR,
+    "tag_name": AppiumBy.TAG_NAME,
+})
+
+# Locator types find_first_matching turns into an XPath attribute test
+_XPATH_ATTRIBUTES = MappingProxyType({
+    "id": "resource-id",
+    "accessibility_id": "content-desc",
+    "class_name": "class",
+})
+
+
+def _resolve_by(locator_type: str) -> str:
+    """
+    Map a string locator type to its AppiumBy constant.
+    
+    Args:
+        locator_type: Type of locator (case-insensitive)
+        
+    Returns:
+        str: AppiumBy strategy
+        
+    Raises:
+        ValueError: If the locator type is not supported
+    """
+    # OPTIMIZED: Lowercase names (the common case) hit the shared map directly - no .lower() copy
+    by = _LOCATOR_MAP.get(locator_type) or _LOCATOR_MAP.get(locator_type.lower())
+    if by is None:
+        raise ValueError(f"Unsupported locator type: {locator_type}")
+    return by
+
 
 class BasePage:
     """Base class for all page objects with common UI interaction methods."""
     
+    # W3C actions payload for swipe_right_fast and its encoded body (built on first use)
+    _swipe_right_payload = None
+    _swipe_right_body = None
+    
     def __init__(self):
         """Initialize the base page with driver reference."""
         self.driver = get_driver()
@@ -46,19 +93,7 @@ class BasePage:
         timeout = timeout or self.wait_timeout
         wait = WebDriverWait(self.driver, timeout)
         
-        # Map string locator types to AppiumBy constants
-        locator_map = {
-            "id": AppiumBy.ID,
-            "xpath": AppiumBy.XPATH,
-            "class_name": AppiumBy.CLASS_NAME,
-            "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
-            "android_uiautomator": AppiumBy.ANDROID_UIAUTOMATOR,
-            "tag_name": AppiumBy.TAG_NAME,
-        }
-        
-        by = locator_map.get(locator_type.lower())
-        if by is None:
-            raise ValueError(f"Unsupported locator type: {locator_type}")
+        by = _resolve_by(locator_type)
         
         try:
             element = wait.until(EC.presence_of_element_located((by, locator_value)))
@@ -88,18 +123,7 @@ class BasePage:
         timeout = timeout or self.wait_timeout
         wait = WebDriverWait(self.driver, timeout)
         
-        locator_map = {
-            "id": AppiumBy.ID,
-            "xpath": AppiumBy.XPATH,
-            "class_name": AppiumBy.CLASS_NAME,
-            "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
-            "android_uiautomator": AppiumBy.ANDROID_UIAUTOMATOR,
-            "tag_name": AppiumBy.TAG_NAME,
-        }
-        
-        by = locator_map.get(locator_type.lower())
-        if by is None:
-            raise ValueError(f"Unsupported locator type: {locator_type}")
+        by = _resolve_by(locator_type)
         
         try:
             wait.until(EC.presence_of_element_located((by, locator_value)))
@@ -110,6 +134,50 @@ class BasePage:
             logger.warning(f"No elements found: {locator_type}={locator_value}")
             return []
     
+    def find_first_matching(
+        self,
+        locators,
+        timeout: Optional[float] = None
+    ) -> Optional[WebElement]:
+        """
+        Find the first element matching any of several locators in a single server query.
+        
+        The locators are combined into one XPath union, so N candidates cost one
+        find_elements round trip instead of N presence checks. Matches come back in
+        document order, not in the order of the locators.
+        
+        Args:
+            locators: Iterable of (locator_type, locator_value) tuples
+                      (id, accessibility_id, class_name or xpath)
+            timeout: Optional timeout in seconds to wait for a match (None = check once)
+            
+        Returns:
+            WebElement: First matching element, or None if nothing matches
+        """
+        xpaths = []
+        for locator_type, locator_value in locators:
+            locator_type = locator_type.lower()
+            if locator_type == "xpath":
+                xpaths.append(locator_value)
+                continue
+            attribute = _XPATH_ATTRIBUTES.get(locator_type)
+            if attribute is None:
+                raise ValueError(f"Unsupported locator type for combined lookup: {locator_type}")
+            quote = '"' if "'" in locator_value else "'"
+            xpaths.append(f"//*[@{attribute}={quote}{locator_value}{quote}]")
+        
+        combined = " | ".join(xpaths)
+        if timeout:
+            try:
+                elements = WebDriverWait(self.driver, timeout).until(
+                    lambda driver: driver.find_elements(AppiumBy.XPATH, combined)
+                )
+            except TimeoutException:
+                return None
+        else:
+            elements = self.driver.find_elements(AppiumBy.XPATH, combined)
+        return elements[0] if elements else None
+    
     def tap(self, locator_type: str, locator_value: str, timeout: Optional[int] = None):
         """
         Tap on an element.
@@ -222,19 +290,7 @@ class BasePage:
         try:
             wait = WebDriverWait(self.driver, timeout)
             
-            # Map string locator types to AppiumBy constants
-            locator_map = {
-                "id": AppiumBy.ID,
-                "xpath": AppiumBy.XPATH,
-                "class_name": AppiumBy.CLASS_NAME,
-                "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
-                "android_uiautomator": AppiumBy.ANDROID_UIAUTOMATOR,
-                "tag_name": AppiumBy.TAG_NAME,
-            }
-            
-            by = locator_map.get(locator_type.lower())
-            if by is None:
-                return False
+            by = _resolve_by(locator_type)  # Unsupported type -> ValueError -> False below
             
             # Use expected_conditions without logging
             element = wait.until(EC.presence_of_element_located((by, locator_value)))
@@ -274,6 +330,32 @@ class BasePage:
         end_y = int(size["height"] * 0.2)
         self.swipe(start_x, start_y, start_x, end_y, duration)
     
+    def swipe_up_repeated(self, count: int = 2, duration: int = 300):
+        """
+        Swipe up several times with a single W3C actions request.
+        
+        OPTIMIZED: All strokes go out as one pointer sequence that UiAutomator2 performs
+        synchronously - one round trip instead of one swipe command plus a settle sleep each.
+        
+        Args:
+            count: Number of swipe strokes
+            duration: Duration of each stroke in milliseconds
+        """
+        size = self.driver.get_window_size()
+        x = size["width"] // 2
+        start_y = int(size["height"] * 0.8)
+        end_y = int(size["height"] * 0.2)
+        
+        touch = PointerInput(interaction.POINTER_TOUCH, "touch")
+        actions = ActionBuilder(self.driver, mouse=touch, duration=duration)
+        for _ in range(count):
+            touch.create_pointer_move(duration=0, x=x, y=start_y, origin="viewport")
+            touch.create_pointer_down(button=MouseButton.LEFT)
+            touch.create_pointer_move(duration=duration, x=x, y=end_y, origin="viewport")
+            touch.create_pointer_up(MouseButton.LEFT)
+            touch.create_pause(0.1)  # Finger lifted briefly so each stroke registers as its own swipe
+        actions.perform()
+    
     def swipe_down(self, duration: int = 1000):
         """Swipe down on the screen."""
         size = self.driver.get_window_size()
@@ -298,6 +380,48 @@ class BasePage:
         start_y = size["height"] // 2
         self.swipe(start_x, start_y, end_x, start_y, duration)  # Ultra-fast swipe: 200ms
     
+    def swipe_right_fast(self):
+        """
+        Swipe right (like gesture) by posting a prebuilt W3C actions payload.
+        
+        OPTIMIZED: Same gesture as swipe_right(), but the screen size is read once and the
+        JSON body is encoded once per page object, then posted as-is - no window size
+        round trip, ActionBuilder objects or json.dumps per swipe. The raw post goes through
+        Selenium's private executor API; if that changes shape, the same cached payload is
+        sent through the public driver.execute() instead.
+        """
+        body = self._swipe_right_body
+        if body is None:
+            size = self.driver.get_window_size()
+            start_x = int(size["width"] * 0.2)
+            end_x = int(size["width"] * 0.8)
+            start_y = size["height"] // 2
+            payload = {"actions": [{
+                "type": "pointer",
+                "id": "touch",
+                "parameters": {"pointerType": "touch"},
+                "actions": [
+                    {"type": "pointerMove", "duration": 0, "x": start_x, "y": start_y, "origin": "viewport"},
+                    {"type": "pointerDown", "button": 0},
+                    {"type": "pointerMove", "duration": 200, "x": end_x, "y": start_y, "origin": "viewport"},
+                    {"type": "pointerUp", "button": 0},
+                ],
+            }]}
+            body = json.dumps(payload).encode("utf-8")
+            self._swipe_right_payload = payload
+            self._swipe_right_body = body
+        
+        executor = self.driver.command_executor
+        try:
+            response = executor._request("POST", f"{executor._url}/session/{self.driver.session_id}/actions", body=body)
+        except (AttributeError, TypeError):
+            # Private API changed in this Selenium release - public command path
+            self.driver.execute("w3cActions", self._swipe_right_payload)
+        else:
+            if response:
+                self.driver.error_handler.check_response(response)
+        time.sleep(0.02)  # ULTRA-FAST: Minimal wait (20ms) - just enough for gesture to register
+    
     def wait_for_element(
         self,
         locator_type: str,
@@ -9,9 +9,33 @@ import xml.etree.ElementTree as ET
 from typing import List, Tuple, Optional
 from .base_page import BasePage
 
+try:
+    # lxml (optional): lets handle_popups_quiet scan an already-parsed page source
+    from lxml import etree
+except ImportError:
+    etree = None
+
 logger = logging.getLogger(__name__)
 
 
+def _snapshot_xpath(locator_type: str, locator_value: str) -> str:
+    """
+    XPath equivalent of a locator, for evaluation against a page-source snapshot.
+    
+    Args:
+        locator_type: "id", "accessibility_id" or "xpath"
+        locator_value: Value of the locator
+        
+    Returns:
+        str: XPath expression matching the same elements in the page source
+    """
+    if locator_type == "id":
+        return f"//*[@resource-id='{locator_value}']"
+    if locator_type == "accessibility_id":
+        return f"//*[@content-desc='{locator_value}']"
+    return locator_value
+
+
 class DoubbleSwipePage(BasePage):
     """Page object for the swipe/card screen in Doubble app."""
     
@@ -19,6 +43,11 @@ class DoubbleSwipePage(BasePage):
     _cached_like_button_locator = None  # (locator_type, locator_value)
     _cached_like_button_coords = None   # (x, y) center coordinates
     _cached_like_button_element = None  # Cached element reference
+    _cached_like_button_signature = None  # (x, y, width) of the element when it was cached
+    _like_taps_since_check = 0           # Cached taps since the signature was last verified
+    
+    # Re-verify the cached like button against the live UI every N cached taps
+    LIKE_CACHE_CHECK_INTERVAL = 10
     
     # Like button locators - ordered by reliability (most reliable first)
     # FIXED: Excludes navigation buttons - only finds heart button (no text) on swipe screen
@@ -80,6 +109,11 @@ class DoubbleSwipePage(BasePage):
         ("xpath", "//android.widget.ImageButton[@content-desc='Dismiss']"),
     ]
     
+    # Compiled snapshot queries for the pop-up locators handle_popups_quiet checks (lxml only)
+    _POPUP_QUICK_QUERIES = tuple(
+        etree.XPath(_snapshot_xpath(*locator)) for locator in POPUP_CLOSE_LOCATORS[:5]
+    ) if etree is not None else ()
+    
     # Common pop-up/dialog container classes
     POPUP_CONTAINER_CLASSES = [
         "android.widget.Dialog",
@@ -172,6 +206,7 @@ class DoubbleSwipePage(BasePage):
             center_y = location['y'] + size['height'] // 2
             self._cached_like_button_coords = (center_x, center_y)
             self._cached_like_button_element = element  # Cache element reference
+            self._cached_like_button_signature = (location['x'], location['y'], size['width'])
             if not quiet:
                 logger.debug(f"Cached like button coordinates: ({center_x}, {center_y})")
         except:
@@ -261,8 +296,29 @@ class DoubbleSwipePage(BasePage):
         self._cached_like_button_locator = None
         self._cached_like_button_coords = None
         self._cached_like_button_element = None
+        self._cached_like_button_signature = None
+        self._like_taps_since_check = 0
         logger.debug("Cleared like button cache")
     
+    def _like_button_cache_drifted(self) -> bool:
+        """
+        Check whether the cached like button has moved or disappeared since it was cached.
+        
+        One rect read on the cached element reference - a layout shift or app update
+        changes the signature (or makes the element stale) and invalidates the cache,
+        instead of tapping stale coordinates for the rest of the session.
+        
+        Returns:
+            bool: True if the cache no longer matches the UI, False otherwise
+        """
+        if self._cached_like_button_element is None or self._cached_like_button_signature is None:
+            return False  # Coordinates came from XML analysis - nothing to compare against
+        try:
+            rect = self._cached_like_button_element.rect
+        except Exception:
+            return True  # Stale element - the view was replaced
+        return (rect['x'], rect['y'], rect['width']) != self._cached_like_button_signature
+    
     def click_like_button(self, quiet=False):
         """
         Click the like button.
@@ -274,6 +330,16 @@ class DoubbleSwipePage(BasePage):
         Returns:
             bool: True if button was found and clicked, False otherwise
         """
+        # Amortized drift check: verify the cache against the live UI every N cached taps
+        if self._cached_like_button_coords:
+            self._like_taps_since_check += 1
+            if self._like_taps_since_check >= self.LIKE_CACHE_CHECK_INTERVAL:
+                self._like_taps_since_check = 0
+                if self._like_button_cache_drifted():
+                    if not quiet:
+                        logger.debug("Like button moved since it was cached - re-detecting...")
+                    self.clear_like_button_cache()
+        
         # ULTRA-FAST PATH: If we have cached coordinates, tap directly (no search at all!)
         if self._cached_like_button_coords:
             try:
@@ -320,6 +386,7 @@ class DoubbleSwipePage(BasePage):
                     center_y = location['y'] + size['height'] // 2
                     self._cached_like_button_coords = (center_x, center_y)
                     self._cached_like_button_element = element  # Cache element reference
+                    self._cached_like_button_signature = (location['x'], location['y'], size['width'])
                     if not quiet:
                         logger.debug(f"Extracted and cached coordinates: ({center_x}, {center_y})")
                 except:
@@ -497,19 +564,27 @@ class DoubbleSwipePage(BasePage):
         
         return dismissed_count
     
-    def handle_popups_quiet(self, max_attempts=2):
+    def handle_popups_quiet(self, max_attempts=2, root=None):
         """
         Handle pop-ups silently (no error logging for faster like automation).
         OPTIMIZED: Ultra-fast pop-up detection with minimal timeouts.
         
         Args:
             max_attempts: Maximum number of pop-ups to dismiss
+            root: Optional lxml root of a page source just fetched for the current screen -
+                  when no close button is on it, returns without probing the device
             
         Returns:
             int: Number of pop-ups dismissed
         """
         dismissed_count = 0
         
+        # OPTIMIZED: Scan the already-parsed page source in memory first - the device is
+        # only probed (and tapped) when a close button is actually on screen
+        if root is not None and self._POPUP_QUICK_QUERIES:
+            if not any(query(root) for query in self._POPUP_QUICK_QUERIES):
+                return dismissed_count
+        
         for attempt in range(max_attempts):
             popup_found = False
             
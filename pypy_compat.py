@@ -0,0 +1,12 @@
+"""
+Interpreter check shared by the page-source analyzers.
+
+lxml and pyahocorasick are C extensions: on CPython they are much faster than the
+pure-Python fallbacks, but under PyPy the C-extension bridge makes them slower than
+the stdlib code, which PyPy's JIT runs fast (run the analyzers with pypy3 for that path).
+Optional C-extension imports are therefore only attempted when IS_CPYTHON is true.
+"""
+
+import platform
+
+IS_CPYTHON = platform.python_implementation() == "CPython"